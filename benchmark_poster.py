@@ -2,10 +2,44 @@
 """
 Benchmark de génération de poster pour identifier les goulots d'étranglement
 """
+import csv
+import gc
+import os
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 sys.path.insert(0, '.')
 
+# BENCH_DRAFT=1: rendu brouillon à DPI réduit (buffer Agg 4× plus petit)
+DRAFT_DPI = 150
+DPI = DRAFT_DPI if os.environ.get('BENCH_DRAFT') else 300
+# Historique des temps par phase (une ligne par exécution)
+PHASE_TIMINGS_FILE = "posters/_phase_timings.csv"
+
+
+def _clock(fn, *args, **kwargs):
+    """
+    Exécute fn et retourne (résultat, durée en ns)
+
+    perf_counter_ns est monotone et haute résolution (time.time() peut
+    n'avoir qu'une résolution de l'ordre de la ms et subir l'ajustement NTP).
+    """
+    start = time.perf_counter_ns()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter_ns() - start
+
+
+def _timed(fn, *args, **kwargs):
+    """Comme _clock, avec le GC désactivé pendant la mesure pour ne pas bruiter la phase"""
+    gc.collect()
+    gc.disable()
+    try:
+        return _clock(fn, *args, **kwargs)
+    finally:
+        gc.enable()
+
+
 def benchmark_generation():
     print("🔍 Benchmark de génération de poster\n")
     
@@ -13,34 +47,34 @@ def benchmark_generation():
         get_coordinates, load_theme, load_fonts,
         create_poster
     )
-    import create_map_poster as cmp
     
     city = "Lauris"
     country = "France"
     theme = "terracotta"
     distance = 12000
     
-    # 1. Géocodage
-    start = time.time()
-    coords = get_coordinates(city, country)
-    geocoding_time = time.time() - start
-    print(f"1. Géocodage: {geocoding_time:.2f}s")
-    
-    # 2. Chargement du thème
-    start = time.time()
-    cmp.THEME = load_theme(theme)
-    theme_time = time.time() - start
-    print(f"2. Chargement thème: {theme_time:.2f}s")
-    
-    # 3. Chargement des polices
-    start = time.time()
-    fonts = load_fonts()
-    fonts_time = time.time() - start
-    print(f"3. Chargement polices: {fonts_time:.2f}s")
+    # 1-3. Géocodage (réseau) en parallèle du chargement thème/polices
+    # (disque + parsing): les phases sont indépendantes, seule la
+    # génération a besoin des trois résultats
+    def prepare():
+        with ThreadPoolExecutor(3) as ex:
+            f_coords = ex.submit(_clock, get_coordinates, city, country)
+            f_theme = ex.submit(_clock, load_theme, theme)
+            f_fonts = ex.submit(_clock, load_fonts)
+            return f_coords.result(), f_theme.result(), f_fonts.result()
+
+    phases, setup_ns = _timed(prepare)
+    (coords, geocoding_ns), (theme_data, theme_ns), (fonts, fonts_ns) = phases
+    print(f"1. Géocodage: {geocoding_ns/1e6:.1f} ms")
+    print(f"2. Chargement thème: {theme_ns/1e6:.1f} ms")
+    print(f"3. Chargement polices: {fonts_ns/1e6:.1f} ms")
+    sequential_ns = geocoding_ns + theme_ns + fonts_ns
+    print(f"   → Préparation en parallèle: {setup_ns/1e6:.1f} ms "
+          f"(séquentiel: {sequential_ns/1e6:.1f} ms)")
     
     # 4. Génération complète
-    start = time.time()
-    create_poster(
+    _, generation_ns = _timed(
+        create_poster,
         city=city,
         country=country,
         point=coords,
@@ -49,19 +83,37 @@ def benchmark_generation():
         output_format="png",
         width=12,
         height=16,
-        fonts=fonts
+        fonts=fonts,
+        theme=theme_data,
+        dpi=DPI
     )
-    generation_time = time.time() - start
-    print(f"4. Génération poster: {generation_time:.2f}s")
+    print(f"4. Génération poster ({DPI} DPI): {generation_ns/1e6:.1f} ms")
     
-    total = geocoding_time + theme_time + fonts_time + generation_time
+    geocoding_time = geocoding_ns / 1e9
+    theme_time = theme_ns / 1e9
+    fonts_time = fonts_ns / 1e9
+    generation_time = generation_ns / 1e9
+    total = (setup_ns + generation_ns) / 1e9
     print(f"\n⏱️  TOTAL: {total:.2f}s")
     
-    # Breakdown
+    # Breakdown (sur le temps cumulé des phases, qui se recouvrent)
+    busy = geocoding_time + theme_time + fonts_time + generation_time
     print(f"\n📊 Répartition:")
-    print(f"   - Géocodage: {geocoding_time/total*100:.1f}%")
-    print(f"   - Génération: {generation_time/total*100:.1f}%")
-    print(f"   - Autres: {(theme_time+fonts_time)/total*100:.1f}%")
+    print(f"   - Géocodage: {geocoding_time/busy*100:.1f}%")
+    print(f"   - Génération: {generation_time/busy*100:.1f}%")
+    print(f"   - Autres: {(theme_time+fonts_time)/busy*100:.1f}%")
+
+    write_header = not os.path.exists(PHASE_TIMINGS_FILE)
+    with open(PHASE_TIMINGS_FILE, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(["timestamp", "theme", "dpi", "geocoding", "theme_load", "fonts", "generation", "total"])
+        writer.writerow([
+            datetime.now().isoformat(timespec="seconds"), theme, DPI,
+            f"{geocoding_time:.6f}", f"{theme_time:.6f}", f"{fonts_time:.6f}",
+            f"{generation_time:.6f}", f"{total:.6f}",
+        ])
+    print(f"\n📝 Temps enregistrés dans {PHASE_TIMINGS_FILE}")
 
 if __name__ == '__main__':
     benchmark_generation()
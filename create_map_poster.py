@@ -9,25 +9,39 @@ high-quality poster-ready images with roads, water features, and parks.
 
 import argparse
 import asyncio
+import functools
 import json
 import os
 import pickle
 import sys
+import threading
 import time
+import traceback
+import weakref
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import cast
 
+import matplotlib
 import matplotlib.colors as mcolors
+import geopandas as gpd
 import matplotlib.pyplot as plt
 import numpy as np
 import osmnx as ox
+import pyproj
+import shapely
 from geopandas import GeoDataFrame
 from geopy.geocoders import Nominatim
 from lat_lon_parser import parse
+from matplotlib.collections import LineCollection, PathCollection
 from matplotlib.font_manager import FontProperties
+from matplotlib.patches import Rectangle
+from matplotlib.path import Path as MplPath
 from networkx import MultiDiGraph
-from shapely.geometry import Point
+from PIL import Image
 from tqdm import tqdm
 
 from font_management import load_fonts
@@ -37,18 +51,64 @@ class CacheError(Exception):
     """Raised when a cache operation fails."""
 
 
-CACHE_DIR_PATH = os.environ.get("CACHE_DIR", "cache")
+# Posters are only ever saved to disk, never shown: use the headless Agg
+# rasterizer instead of letting matplotlib probe for a GUI backend.
+matplotlib.use("Agg")
+
+# Bundled resources (themes, fonts, data, cache) are resolved next to this
+# file, so the module works from any working directory. Posters are an
+# output and stay relative to the caller's working directory.
+BASE_DIR = Path(__file__).resolve().parent
+
+CACHE_DIR_PATH = os.environ.get("CACHE_DIR", str(BASE_DIR / "cache"))
 CACHE_DIR = Path(CACHE_DIR_PATH)
 CACHE_DIR.mkdir(exist_ok=True)
+# osmnx keeps its raw HTTP responses in ./cache by default: same directory
+ox.settings.cache_folder = CACHE_DIR_PATH
 
-THEMES_DIR = "themes"
-FONTS_DIR = "fonts"
+THEMES_DIR = str(BASE_DIR / "themes")
+FONTS_DIR = str(BASE_DIR / "fonts")
 POSTERS_DIR = "posters"
 
 FILE_ENCODING = "utf-8"
 
+# Set POSTER_DEBUG=1 to print diagnostics about the fetched layers.
+DEBUG = os.environ.get("POSTER_DEBUG", "") not in ("", "0")
+
 FONTS = load_fonts()
 
+# In-process layer in front of the pickle cache. Workers forked after a
+# prefetch inherit these objects copy-on-write instead of re-reading disk.
+MEMORY_CACHE_MAX_ENTRIES = 32
+_MEMORY_CACHE: dict = {}
+# Layers are fetched from several threads at once
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+# At most this many Overpass requests in flight (the public instance grants
+# two slots per client). Cache hits are never throttled; osmnx additionally
+# waits for a free slot via the Overpass /status endpoint.
+OVERPASS_CONCURRENCY = 2
+_OVERPASS_SLOTS = threading.BoundedSemaphore(OVERPASS_CONCURRENCY)
+# Threads used to fetch the street network and the feature layers concurrently
+FETCH_WORKERS = 2
+
+# Cache files are zlib-compressed pickles. Level 1 already shrinks graphs
+# and GeoDataFrames 2-3x (fewer pages to read and keep cached) while
+# decompressing faster than the pickle itself loads.
+CACHE_COMPRESS_LEVEL = 1
+# Uncompressed pickles written by older versions start with the protocol
+# opcode; they are still read as-is.
+_PICKLE_MAGIC = pickle.PROTO
+
+
+def _memory_cache_put(key: str, value):
+    """Store a value in the in-process cache, evicting the oldest entry when full."""
+    with _MEMORY_CACHE_LOCK:
+        _MEMORY_CACHE.pop(key, None)
+        if len(_MEMORY_CACHE) >= MEMORY_CACHE_MAX_ENTRIES:
+            _MEMORY_CACHE.pop(next(iter(_MEMORY_CACHE)))
+        _MEMORY_CACHE[key] = value
+
 
 def _cache_path(key: str) -> str:
     """
@@ -77,19 +137,29 @@ def cache_get(key: str):
     Raises:
         CacheError: If cache read operation fails
     """
+    # Single lookup: another thread may evict the key between a membership
+    # test and the read (cached values are never None)
+    value = _MEMORY_CACHE.get(key)
+    if value is not None:
+        return value
     try:
         path = _cache_path(key)
         if not os.path.exists(path):
             return None
         with open(path, "rb") as f:
-            return pickle.load(f)
+            data = f.read()
+        if not data.startswith(_PICKLE_MAGIC):
+            data = zlib.decompress(data)
+        value = pickle.loads(data)
     except Exception as e:
         raise CacheError(f"Cache read failed: {e}") from e
+    _memory_cache_put(key, value)
+    return value
 
 
 def cache_set(key: str, value):
     """
-    Store an object in the cache.
+    Store an object in the cache as a zlib-compressed pickle.
 
     Args:
         key: Cache key identifier
@@ -98,42 +168,60 @@ def cache_set(key: str, value):
     Raises:
         CacheError: If cache write operation fails
     """
+    _memory_cache_put(key, value)
     try:
         if not os.path.exists(CACHE_DIR):
             os.makedirs(CACHE_DIR)
         path = _cache_path(key)
+        data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), CACHE_COMPRESS_LEVEL)
         with open(path, "wb") as f:
-            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(data)
     except Exception as e:
         raise CacheError(f"Cache write failed: {e}") from e
 
 
 # Land Polygons Loading
+LAND_POLYGONS_PATH = str(BASE_DIR / "data/land_polygons/land-polygons-split-4326/land_polygons.shp")
 _LAND_POLYGONS_CACHE = None
+# STRtree over _LAND_POLYGONS_CACHE, built when the world layer is loaded
+_LAND_POLYGONS_TREE = None
 
 
-def load_land_polygons():
+def load_land_polygons(bbox=None):
     """
     Load OSM land polygons shapefile (lazy loading with caching).
 
-    Returns GeoDataFrame with land polygons for the entire world.
+    With bbox=(lon_min, lat_min, lon_max, lat_max), only the polygons
+    intersecting it are read: pyogrio applies the filter inside the reader
+    (using the shapefile's spatial index when present), so the world-wide
+    layer is never materialized for a single poster. Once the world layer
+    is in memory, bbox requests are answered from its STRtree instead.
+
+    Only the geometry column is read: the attribute table is never used
+    for drawing and would otherwise stay resident with the cached layer.
+
+    Without bbox, returns GeoDataFrame with land polygons for the entire world.
     The shapefile is loaded once and cached in memory for subsequent calls.
     """
-    global _LAND_POLYGONS_CACHE
+    global _LAND_POLYGONS_CACHE, _LAND_POLYGONS_TREE
 
     if _LAND_POLYGONS_CACHE is not None:
-        return _LAND_POLYGONS_CACHE
-
-    import geopandas as gpd
-    land_polygons_path = "data/land_polygons/land-polygons-split-4326/land_polygons.shp"
+        if bbox is None:
+            return _LAND_POLYGONS_CACHE
+        hits = _LAND_POLYGONS_TREE.query(shapely.box(*bbox), predicate="intersects")
+        return _LAND_POLYGONS_CACHE.iloc[np.sort(hits)]
 
-    if not os.path.exists(land_polygons_path):
-        print(f"⚠️  WARNING: Land polygons not found at {land_polygons_path}")
+    if not os.path.exists(LAND_POLYGONS_PATH):
+        print(f"⚠️  WARNING: Land polygons not found at {LAND_POLYGONS_PATH}")
         print("   Download from: https://osmdata.openstreetmap.de/data/land-polygons.html")
         return None
 
+    if bbox is not None:
+        return gpd.read_file(LAND_POLYGONS_PATH, engine="pyogrio", columns=[], bbox=bbox)
+
     print("📂 Loading land polygons shapefile (one-time load)...")
-    _LAND_POLYGONS_CACHE = gpd.read_file(land_polygons_path)
+    _LAND_POLYGONS_CACHE = gpd.read_file(LAND_POLYGONS_PATH, engine="pyogrio", columns=[])
+    _LAND_POLYGONS_TREE = shapely.STRtree(_LAND_POLYGONS_CACHE.geometry.values)
     print(f"✓ Loaded {len(_LAND_POLYGONS_CACHE)} land polygons")
     return _LAND_POLYGONS_CACHE
 
@@ -149,29 +237,27 @@ def is_latin_script(text):
     :param text: Text to analyze
     :return: True if text is primarily Latin script, False otherwise
     """
-    if not text:
+    # Empty or pure ASCII (most city names): every letter is Basic Latin
+    if not text or text.isascii():
         return True
 
-    latin_count = 0
-    total_alpha = 0
-
-    for char in text:
-        if char.isalpha():
-            total_alpha += 1
-            # Latin Unicode ranges:
-            # - Basic Latin: U+0000 to U+007F
-            # - Latin-1 Supplement: U+0080 to U+00FF
-            # - Latin Extended-A: U+0100 to U+017F
-            # - Latin Extended-B: U+0180 to U+024F
-            if ord(char) < 0x250:
-                latin_count += 1
+    # isalpha() has no vectorized equivalent, but filter() runs it in C
+    letters = "".join(filter(str.isalpha, text))
 
     # If no alphabetic characters, default to Latin (numbers, symbols, etc.)
-    if total_alpha == 0:
+    if not letters:
         return True
 
+    # Latin Unicode ranges:
+    # - Basic Latin: U+0000 to U+007F
+    # - Latin-1 Supplement: U+0080 to U+00FF
+    # - Latin Extended-A: U+0100 to U+017F
+    # - Latin Extended-B: U+0180 to U+024F
+    codepoints = np.frombuffer(letters.encode("utf-32-le"), dtype=np.uint32)
+    latin_count = np.count_nonzero(codepoints < 0x250)
+
     # Consider it Latin if >80% of alphabetic characters are Latin
-    return (latin_count / total_alpha) > 0.8
+    return bool(latin_count / codepoints.size > 0.8)
 
 
 def generate_output_filename(city, theme_name, output_format, dist=None):
@@ -197,29 +283,45 @@ def generate_output_filename(city, theme_name, output_format, dist=None):
 def get_available_themes():
     """
     Scans the themes directory and returns a list of available theme names.
+
+    The listing is memoized on the directory's modification time, so it is
+    only re-read after a theme file is added, removed or renamed.
     """
     if not os.path.exists(THEMES_DIR):
         os.makedirs(THEMES_DIR)
         return []
 
+    return list(_list_theme_names(THEMES_DIR, os.stat(THEMES_DIR).st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=1)
+def _list_theme_names(themes_dir, _mtime_ns):
+    """Sorted theme names found in themes_dir (cached per directory mtime)."""
     themes = []
-    for file in sorted(os.listdir(THEMES_DIR)):
+    for file in sorted(os.listdir(themes_dir)):
         if file.endswith(".json"):
             theme_name = file[:-5]  # Remove .json extension
             themes.append(theme_name)
-    return themes
+    return tuple(themes)
 
 
+@functools.lru_cache(maxsize=None)
 def load_theme(theme_name="terracotta"):
     """
     Load theme from JSON file in themes directory.
+
+    Results are memoized per theme name and returned as a read-only mapping
+    so the shared cached copy cannot be mutated by callers. The road colors
+    are also flattened into a per-highway lookup table (see
+    build_edge_color_map()) stored under "_edge_color_map". Call
+    load_theme.cache_clear() after editing theme files in a running process.
     """
     theme_file = os.path.join(THEMES_DIR, f"{theme_name}.json")
 
     if not os.path.exists(theme_file):
         print(f"⚠ Theme file '{theme_file}' not found. Using default terracotta theme.")
         # Fallback to embedded terracotta theme
-        return {
+        theme = {
             "name": "Terracotta",
             "description": "Mediterranean warmth - burnt orange and clay tones on cream",
             "bg": "#F5EDE4",
@@ -234,19 +336,37 @@ def load_theme(theme_name="terracotta"):
             "road_residential": "#E5C4B0",
             "road_default": "#D9A08A",
         }
+    else:
+        with open(theme_file, "r", encoding=FILE_ENCODING) as f:
+            theme = json.load(f)
+            print(f"✓ Loaded theme: {theme.get('name', theme_name)}")
+            if "description" in theme:
+                print(f"  {theme['description']}")
 
-    with open(theme_file, "r", encoding=FILE_ENCODING) as f:
-        theme = json.load(f)
-        print(f"✓ Loaded theme: {theme.get('name', theme_name)}")
-        if "description" in theme:
-            print(f"  {theme['description']}")
-        return theme
+    theme["_edge_color_map"] = MappingProxyType(build_edge_color_map(theme))
+    return MappingProxyType(theme)
 
 
 # Load theme (can be changed via command line or input)
 THEME = dict[str, str]()  # Will be loaded later
 
 
+@functools.lru_cache(maxsize=32)
+def _gradient_rgba(color, location):
+    """
+    Returns the 256x1 RGBA fade image for a color, opaque at the edge.
+
+    Built once per (color, location) as read-only uint8, the pixel format
+    Agg resamples directly; every poster of a batch reuses the same array.
+    """
+    gradient = np.empty((256, 1, 4), dtype=np.uint8)
+    gradient[..., :3] = np.round(np.array(mcolors.to_rgb(color)) * 255)
+    alpha = np.round(np.linspace(0, 255, 256))
+    gradient[:, 0, 3] = alpha[::-1] if location == "bottom" else alpha
+    gradient.flags.writeable = False
+    return gradient
+
+
 def create_gradient_fade(ax, color, location="bottom", zorder=10, height=0.25):
     """
     Creates a fade effect at the top or bottom of the map.
@@ -254,26 +374,17 @@ def create_gradient_fade(ax, color, location="bottom", zorder=10, height=0.25):
     Args:
         height: Gradient height as fraction of image (0.0-0.5). Default 0.25 = 25%.
     """
-    vals = np.linspace(0, 1, 256).reshape(-1, 1)
-    gradient = np.hstack((vals, vals))
-
-    rgb = mcolors.to_rgb(color)
-    my_colors = np.zeros((256, 4))
-    my_colors[:, 0] = rgb[0]
-    my_colors[:, 1] = rgb[1]
-    my_colors[:, 2] = rgb[2]
+    # RGBA image built directly (256 rows, 1 column): imshow draws it
+    # as-is instead of normalizing scalars through a per-call colormap
+    gradient = _gradient_rgba(color, location)
 
     if location == "bottom":
-        my_colors[:, 3] = np.linspace(1, 0, 256)
         extent_y_start = 0
         extent_y_end = height
     else:
-        my_colors[:, 3] = np.linspace(0, 1, 256)
         extent_y_start = 1.0 - height
         extent_y_end = 1.0
 
-    custom_cmap = mcolors.ListedColormap(my_colors)
-
     xlim = ax.get_xlim()
     ylim = ax.get_ylim()
     y_range = ylim[1] - ylim[0]
@@ -285,74 +396,226 @@ def create_gradient_fade(ax, color, location="bottom", zorder=10, height=0.25):
         gradient,
         extent=[xlim[0], xlim[1], y_bottom, y_top],
         aspect="auto",
-        cmap=custom_cmap,
         zorder=zorder,
         origin="lower",
     )
 
 
-def get_edge_colors_by_type(g):
+# OSM highway tag -> theme color key. Tags not listed use "road_default".
+HIGHWAY_ROAD_CLASSES = {
+    "motorway": "road_motorway",
+    "motorway_link": "road_motorway",
+    "trunk": "road_primary",
+    "trunk_link": "road_primary",
+    "primary": "road_primary",
+    "primary_link": "road_primary",
+    "secondary": "road_secondary",
+    "secondary_link": "road_secondary",
+    "tertiary": "road_tertiary",
+    "tertiary_link": "road_tertiary",
+    "residential": "road_residential",
+    "living_street": "road_residential",
+    "unclassified": "road_residential",
+}
+
+# Line width per road class; residential and other roads use 0.4
+ROAD_CLASS_WIDTHS = {
+    "road_motorway": 1.2,
+    "road_primary": 1.0,
+    "road_secondary": 0.8,
+    "road_tertiary": 0.6,
+}
+
+
+# Line width per highway tag, derived once from ROAD_CLASS_WIDTHS
+HIGHWAY_ROAD_WIDTHS = {
+    highway: ROAD_CLASS_WIDTHS.get(road_class, 0.4) for highway, road_class in HIGHWAY_ROAD_CLASSES.items()
+}
+
+
+def build_edge_color_map(theme):
     """
-    Assigns colors to edges based on road type hierarchy.
-    Returns a list of colors corresponding to each edge in the graph.
+    Flattens a theme into a {highway tag: color} lookup table.
+
+    load_theme() stores the result under the "_edge_color_map" key, so
+    coloring an edge is a single dict lookup with no per-class step.
+
+    Args:
+        theme: Theme mapping with the road_* color keys
+
+    Returns:
+        Dict mapping each HIGHWAY_ROAD_CLASSES tag to its theme color
     """
-    edge_colors = []
+    return {highway: theme[road_class] for highway, road_class in HIGHWAY_ROAD_CLASSES.items()}
 
-    for _u, _v, data in g.edges(data=True):
-        # Get the highway type (can be a list or string)
-        highway = data.get('highway', 'unclassified')
 
+def get_edge_highways(g):
+    """
+    Returns the highway tag of every edge of the graph, in edge order.
+
+    Edges are visited once, so colors and widths can both be derived from
+    the result without walking the graph again.
+
+    Args:
+        g: Street network graph
+
+    Returns:
+        List of highway tags (the first one for multi-valued edges)
+    """
+    highways = []
+    # Get the highway type (can be a list or string)
+    for _u, _v, highway in g.edges(data="highway", default="unclassified"):
         # Handle list of highway types (take the first one)
         if isinstance(highway, list):
-            highway = highway[0] if highway else 'unclassified'
-
-        # Assign color based on road type
-        if highway in ["motorway", "motorway_link"]:
-            color = THEME["road_motorway"]
-        elif highway in ["trunk", "trunk_link", "primary", "primary_link"]:
-            color = THEME["road_primary"]
-        elif highway in ["secondary", "secondary_link"]:
-            color = THEME["road_secondary"]
-        elif highway in ["tertiary", "tertiary_link"]:
-            color = THEME["road_tertiary"]
-        elif highway in ["residential", "living_street", "unclassified"]:
-            color = THEME["road_residential"]
-        else:
-            color = THEME['road_default']
+            highway = highway[0] if highway else "unclassified"
+        highways.append(highway)
+    return highways
 
-        edge_colors.append(color)
 
-    return edge_colors
+def get_edge_colors_by_type(g, theme=None, highways=None):
+    """
+    Assigns colors to edges based on road type hierarchy.
+    Returns a list of colors corresponding to each edge in the graph.
+    Uses the module-level THEME unless a theme dict is given, and reuses
+    highways from get_edge_highways() when provided.
+    """
+    theme = theme or THEME
+    if highways is None:
+        highways = get_edge_highways(g)
+
+    color_map = theme.get("_edge_color_map") or build_edge_color_map(theme)
+    default = theme["road_default"]
+    return [color_map.get(highway, default) for highway in highways]
 
 
-def get_edge_widths_by_type(g):
+def get_edge_widths_by_type(g, highways=None):
     """
     Assigns line widths to edges based on road type.
     Major roads get thicker lines.
     """
-    edge_widths = []
+    if highways is None:
+        highways = get_edge_highways(g)
 
-    for _u, _v, data in g.edges(data=True):
-        highway = data.get('highway', 'unclassified')
+    return [HIGHWAY_ROAD_WIDTHS.get(highway, 0.4) for highway in highways]
+
+
+def get_edge_segments(g):
+    """
+    Returns the drawn polyline of every edge of the graph, in edge order.
+
+    Edges without a geometry attribute are straight lines between their
+    end nodes, as in ox.graph_to_gdfs(fill_edge_geometry=True). All
+    coordinates are read from shapely in one batch instead of building an
+    edge GeoDataFrame.
+
+    Args:
+        g: Projected street network graph
+
+    Returns:
+        List of (n, 2) coordinate arrays, one per edge
+    """
+    geometries = []
+    straight = []  # (index, u, v) of edges without a geometry
+    for u, v, geometry in g.edges(data="geometry"):
+        if geometry is None:
+            straight.append((len(geometries), u, v))
+        geometries.append(geometry)
+    if not geometries:
+        return []
+
+    if straight:
+        # Plain dicts: NodeView lookups cost more than the coordinates themselves
+        xs = dict(g.nodes(data="x"))
+        ys = dict(g.nodes(data="y"))
+        ends = np.array([[(xs[u], ys[u]), (xs[v], ys[v])] for _i, u, v in straight])
+        lines = shapely.linestrings(ends)
+        for (i, _u, _v), line in zip(straight, lines):
+            geometries[i] = line
+
+    coords, index = shapely.get_coordinates(np.asarray(geometries, dtype=object), return_index=True)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(index)) + 1, [len(coords)])).tolist()
+    # Plain slicing: np.split() costs a swapaxes() call per edge
+    return [coords[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+# Theme-independent road drawing data per projected graph, so the posters
+# of one area (e.g. --all-themes) walk the edges only once. Weak keys: the
+# entries go away with the graph.
+_EDGE_DRAW_DATA = weakref.WeakKeyDictionary()
 
-        if isinstance(highway, list):
-            highway = highway[0] if highway else 'unclassified'
-
-        # Assign width based on road importance
-        if highway in ["motorway", "motorway_link"]:
-            width = 1.2
-        elif highway in ["trunk", "trunk_link", "primary", "primary_link"]:
-            width = 1.0
-        elif highway in ["secondary", "secondary_link"]:
-            width = 0.8
-        elif highway in ["tertiary", "tertiary_link"]:
-            width = 0.6
-        else:
-            width = 0.4
 
-        edge_widths.append(width)
+def _pack_segments(segments):
+    """
+    Flattens a list of (n, 2) segments into one coordinate array plus the
+    boundaries of each segment, a layout that pickles as two buffers.
+
+    Coordinates stay float64: matplotlib converts Path vertices to float64
+    anyway, and float32 UTM northings (~5e6 m) only resolve 0.5 m.
+    """
+    if not segments:
+        return np.empty((0, 2)), np.zeros(1, dtype=np.int64)
+    bounds = np.zeros(len(segments) + 1, dtype=np.int64)
+    np.cumsum([len(segment) for segment in segments], out=bounds[1:])
+    return np.concatenate(segments), bounds
+
+
+def _unpack_segments(coords, bounds):
+    """Inverse of _pack_segments(): views into coords, one per segment."""
+    bounds = bounds.tolist()
+    return [coords[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def get_edge_draw_data(g_proj, cache_key=None):
+    """
+    Returns the edge segments of the graph grouped by road class.
+
+    Within a class every edge has the same color and width, so each group
+    is drawn as one uniform LineCollection. Groups are ordered thinnest
+    first: major roads are drawn over minor ones at crossings. The
+    grouping does not depend on the theme and is memoized per graph
+    object; projected graphs are shared through the in-memory cache, so
+    later posters of the same area reuse it.
+
+    With a cache_key, the groups are also stored in the disk cache (each
+    one as a flat coordinate array), so new processes rendering the same
+    area skip walking the graph.
 
-    return edge_widths
+    Args:
+        g_proj: Projected street network graph
+        cache_key: Optional cache key, see _projection_key()
+
+    Returns:
+        List of (road_class, width, segments) tuples, where road_class is
+        the theme color key
+    """
+    data = _EDGE_DRAW_DATA.get(g_proj)
+    if data is not None:
+        return data
+
+    packed = cache_get(cache_key) if cache_key is not None else None
+    if packed is not None:
+        data = [
+            (road_class, width, _unpack_segments(coords, bounds))
+            for road_class, width, coords, bounds in packed
+        ]
+    else:
+        groups = {}
+        for highway, segment in zip(get_edge_highways(g_proj), get_edge_segments(g_proj)):
+            groups.setdefault(HIGHWAY_ROAD_CLASSES.get(highway, "road_default"), []).append(segment)
+        data = sorted(
+            ((road_class, ROAD_CLASS_WIDTHS.get(road_class, 0.4), segments) for road_class, segments in groups.items()),
+            key=lambda group: (group[1], group[0]),
+        )
+        if cache_key is not None:
+            try:
+                cache_set(
+                    cache_key,
+                    [(road_class, width, *_pack_segments(segments)) for road_class, width, segments in data],
+                )
+            except CacheError as e:
+                print(e)
+    _EDGE_DRAW_DATA[g_proj] = data
+    return data
 
 
 def get_coordinates(city, country):
@@ -409,6 +672,333 @@ def get_coordinates(city, country):
     raise ValueError(f"Could not find coordinates for {city}, {country}")
 
 
+def _projection_key(name, point, dist):
+    """
+    Cache key of a projected layer (or "graph") for an area.
+
+    Includes the PROJ version so that cached projections are recomputed
+    after a PROJ upgrade, since transformation results can change.
+    """
+    lat, lon = point
+    return f"{name}_proj_{lat}_{lon}_{dist}_proj{pyproj.__proj_version__}"
+
+
+def cached_projection(key, project):
+    """
+    Returns a cached projection result, computing and storing it on a miss.
+
+    Projected layers do not depend on the theme, so every poster of an
+    area after the first reuses them from memory or from the disk cache.
+
+    Args:
+        key: Cache key, see _projection_key()
+        project: Zero-argument callable performing the projection
+
+    Returns:
+        Projected object (graph or GeoDataFrame)
+    """
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    value = project()
+    try:
+        cache_set(key, value)
+    except CacheError as e:
+        print(e)
+    return value
+
+
+def land_bbox(point, dist):
+    """
+    Returns the (lon_min, lat_min, lon_max, lat_max) land polygons window.
+
+    Covers the fetch radius (1° of latitude ≈ 111 km) with a 10% margin,
+    and at least ~5 km, around the center.
+    """
+    lat, lon = point
+    lat_margin = max(0.05, 1.1 * dist / 111_320)
+    lon_margin = max(0.05, lat_margin / max(np.cos(np.radians(lat)), 0.01))
+    return lon - lon_margin, lat - lat_margin, lon + lon_margin, lat + lat_margin
+
+
+def load_projected_land(point, dist, crs):
+    """
+    Returns the land polygons around a point, projected to the map CRS.
+
+    The result goes through the projection cache, so the shapefile is read
+    once per area: later posters, and worker processes forked after
+    prefetch_map_data(), reuse the in-memory copy instead of each loading
+    the land polygons themselves.
+
+    Args:
+        point: (latitude, longitude) tuple for map center
+        dist: Fetch radius in meters (see compensated_distance())
+        crs: Map CRS
+
+    Returns:
+        Projected GeoDataFrame (possibly empty), or None if the land
+        polygons shapefile is not available
+    """
+    key = _projection_key("land", point, dist)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    land = load_land_polygons(bbox=land_bbox(point, dist))
+    if land is None:
+        return None
+    if not land.empty:
+        land = land.to_crs(crs)
+    try:
+        cache_set(key, land)
+    except CacheError as e:
+        print(e)
+    return land
+
+
+def project_layers(layers, crs, point, dist):
+    """
+    Projects several feature layers into the map CRS with one transform.
+
+    Layers found in the projection cache are returned from it. The others
+    are selected (see _polygons(), _lines()), their geometries concatenated
+    and transformed by a single to_crs() call, then split back and cached
+    per layer under the same keys as cached_projection().
+
+    Args:
+        layers: Dict mapping each layer name to a zero-argument callable
+            returning the lon/lat GeoDataFrame to draw, or None to skip it;
+            only called on cache misses
+        crs: Map CRS
+        point: (latitude, longitude) tuple for map center
+        dist: Fetch radius in meters (see compensated_distance())
+
+    Returns:
+        Dict mapping the names of the non-skipped layers to projected
+        GeoDataFrames
+    """
+    projected = {}
+    pending = {}
+    for name, select in layers.items():
+        cached = cache_get(_projection_key(name, point, dist))
+        if cached is not None:
+            projected[name] = cached
+            continue
+        gdf = select()
+        if gdf is not None:
+            pending[name] = gdf
+
+    # One transform per source CRS (OSM layers are all EPSG:4326)
+    by_crs = {}
+    for name, gdf in pending.items():
+        by_crs.setdefault(gdf.crs, []).append(name)
+    for source_crs, names in by_crs.items():
+        geometries = np.concatenate([np.asarray(pending[name].geometry.values) for name in names])
+        transformed = gpd.GeoSeries(geometries, crs=source_crs).to_crs(crs).values
+        splits = np.cumsum([len(pending[name]) for name in names])[:-1]
+        for name, part in zip(names, np.split(transformed, splits)):
+            gdf = pending[name]
+            gdf = gdf.set_geometry(gpd.GeoSeries(part, index=gdf.index, crs=crs))
+            try:
+                cache_set(_projection_key(name, point, dist), gdf)
+            except CacheError as e:
+                print(e)
+            projected[name] = gdf
+    return projected
+
+
+# shapely type ids of the geometries kept by _polygons() and _lines()
+_POLYGON_TYPE_IDS = (shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON)
+_LINE_TYPE_IDS = (shapely.GeometryType.LINESTRING, shapely.GeometryType.MULTILINESTRING)
+
+
+def _has_type(gdf, type_ids):
+    """Boolean mask of the features whose shapely geometry type id is in type_ids."""
+    return np.isin(shapely.get_type_id(gdf.geometry.values), type_ids)
+
+
+def _polygons(gdf):
+    """Returns the Polygon/MultiPolygon features of a layer, or None if there are none."""
+    if gdf is None or gdf.empty:
+        return None
+    polygons = gdf[_has_type(gdf, _POLYGON_TYPE_IDS)]
+    return None if polygons.empty else polygons
+
+
+def _lines(gdf):
+    """Returns the LineString/MultiLineString features of a layer, or None if there are none."""
+    if gdf is None or gdf.empty:
+        return None
+    lines = gdf[_has_type(gdf, _LINE_TYPE_IDS)]
+    return None if lines.empty else lines
+
+
+def _water_polygons(water_features):
+    """
+    Returns the inland water polygons of the water layer, or None.
+
+    Retain only polygonal geometries, and filter out any large
+    sea/ocean/bay polygons that might have slipped through.  This guards
+    against tag inconsistencies where a multipolygon may still carry an
+    undesired water type.  Both conditions go into a single boolean mask
+    so the layer is indexed (copied) only once.
+    """
+    if water_features is None or water_features.empty:
+        return None
+    keep = _has_type(water_features, _POLYGON_TYPE_IDS)
+    if DEBUG:
+        print(f"🔍 DEBUG: {keep.sum()} water polygons before filtering")
+        print(f"🔍 DEBUG: Columns available: {water_features.columns.tolist()}")
+        # Show some examples of what we have
+        for col in ["place", "water", "natural"]:
+            if col in water_features.columns:
+                unique_vals = water_features.loc[keep, col].dropna().unique()[:10]
+                print(f"🔍 DEBUG: {col} values: {unique_vals.tolist()}")
+    for col in ["place", "water", "natural"]:
+        if col in water_features.columns:
+            keep &= ~water_features[col].isin(SEA_WATER_TAGS).to_numpy()
+    water_polys = water_features[keep]
+    if DEBUG:
+        print(f"🔍 DEBUG: {len(water_polys)} water polygons after filtering")
+    return None if water_polys.empty else water_polys
+
+
+def project_graph_to_utm(g):
+    """
+    Projects a street graph to its local UTM zone with batched transforms.
+
+    Equivalent to ox.project_graph(g), but node coordinates are projected
+    as two NumPy arrays in a single pyproj call and edge geometries in a
+    single shapely.transform call, instead of round-tripping the whole
+    graph through node/edge GeoDataFrames. The input graph is left untouched.
+
+    Args:
+        g: Street network graph in its fetched (geographic) CRS
+
+    Returns:
+        Projected copy of the graph
+    """
+    node_data = [data for _n, data in g.nodes(data=True)]
+    xs = np.fromiter((data["x"] for data in node_data), dtype=np.float64, count=len(node_data))
+    ys = np.fromiter((data["y"] for data in node_data), dtype=np.float64, count=len(node_data))
+
+    # Same UTM/UPS zone selection as osmnx, from the nodes' bounds
+    bounds = GeoDataFrame(
+        geometry=[shapely.box(xs.min(), ys.min(), xs.max(), ys.max())],
+        crs=g.graph["crs"],
+    )
+    to_crs = ox.projection.project_gdf(bounds).crs
+    transformer = pyproj.Transformer.from_crs(g.graph["crs"], to_crs, always_xy=True)
+
+    # Copying the graph dominates the cost of this function
+    g_proj = g.copy()
+    g_proj.graph["crs"] = to_crs
+
+    px, py = transformer.transform(xs, ys)
+    for (_n, data), x, y in zip(g_proj.nodes(data=True), px.tolist(), py.tolist()):
+        data["x"] = x
+        data["y"] = y
+
+    edges = [data for _u, _v, data in g_proj.edges(data=True) if "geometry" in data]
+    if edges:
+        geoms = shapely.transform(
+            np.array([data["geometry"] for data in edges], dtype=object),
+            lambda coords: np.column_stack(transformer.transform(coords[:, 0], coords[:, 1])),
+        )
+        for data, geom in zip(edges, geoms):
+            data["geometry"] = geom
+
+    return g_proj
+
+
+def simplify_for_display(gdf, tolerance):
+    """
+    Returns the geometries of a polygon layer simplified to a tolerance.
+
+    Vertices within a fraction of an output pixel cannot be seen but are
+    still flattened and rasterized by matplotlib; dropping them shrinks
+    the paths drawn (and SVG/PDF files). Topology is not preserved since
+    the result is only filled, never analysed.
+
+    Args:
+        gdf: Projected GeoDataFrame (left untouched, it may be cached)
+        tolerance: Maximum displacement in map units (meters)
+
+    Returns:
+        Simplified GeoSeries, ready to plot
+    """
+    return gdf.geometry.simplify(tolerance, preserve_topology=False)
+
+
+def plot_polygons(ax, geometries, facecolor, zorder):
+    """
+    Draw many polygons as a single compound path.
+
+    GeoDataFrame.plot() builds one Path and one patch per polygon in Python.
+    Here the rings come out of shapely as one contiguous coordinate buffer
+    and the path codes are set with a few array writes, so the cost no
+    longer grows with the number of Python objects. Rings are oriented
+    (exterior counter-clockwise, holes clockwise) so the nonzero fill rule
+    leaves courtyards empty, as the per-polygon patches do.
+
+    Args:
+        ax: Matplotlib axes to draw on
+        geometries: Polygon/MultiPolygon geometries (GeoSeries or array)
+        facecolor: Fill color
+        zorder: Drawing order of the layer
+
+    Returns:
+        The added PathCollection, or None if there was nothing to draw
+    """
+    geometries = np.asarray(geometries)
+    geometries = shapely.orient_polygons(geometries[~shapely.is_empty(geometries)])
+    if len(geometries) == 0:
+        return None
+    _, coords, offsets = shapely.to_ragged_array(geometries)
+    ring_offsets = offsets[0]
+    codes = np.full(len(coords), MplPath.LINETO, dtype=MplPath.code_type)
+    codes[ring_offsets[:-1]] = MplPath.MOVETO
+    codes[ring_offsets[1:] - 1] = MplPath.CLOSEPOLY
+    collection = PathCollection([MplPath(coords, codes)], facecolors=facecolor, edgecolors="none", zorder=zorder)
+    # The crop limits are set explicitly: skip the per-segment data limits
+    # walk, which would cost more than the drawing itself.
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def covers_viewport(gdf, xlim, ylim):
+    """
+    Tells whether the polygons of a layer cover the whole viewport.
+
+    Cheap rejections come first: polygons not touching the viewport are
+    dropped, and if the clipped areas do not add up to the viewport area
+    the union cannot cover it. Only then is the union computed.
+
+    Args:
+        gdf: Projected polygon GeoDataFrame
+        xlim: (x_min, x_max) of the viewport in map units
+        ylim: (y_min, y_max) of the viewport in map units
+
+    Returns:
+        True if every point of the viewport lies within the layer
+    """
+    view = shapely.box(xlim[0], ylim[0], xlim[1], ylim[1])
+    geometries = shapely.make_valid(gdf.geometry.values)
+    geometries = geometries[shapely.intersects(geometries, view)]
+    if len(geometries) == 0:
+        return False
+    if shapely.area(shapely.intersection(geometries, view)).sum() < view.area:
+        return False
+    return bool(shapely.union_all(geometries).covers(view))
+
+
+@functools.lru_cache(maxsize=None)
+def _wgs84_transformer(to_crs):
+    """Return a cached lon/lat → ``to_crs`` transformer."""
+    return pyproj.Transformer.from_crs("EPSG:4326", to_crs, always_xy=True)
+
+
 def get_crop_limits(g_proj, center_lat_lon, fig, dist):
     """
     Crop inward to preserve aspect ratio while guaranteeing
@@ -417,14 +1007,7 @@ def get_crop_limits(g_proj, center_lat_lon, fig, dist):
     lat, lon = center_lat_lon
 
     # Project center point into graph CRS
-    center = (
-        ox.projection.project_geometry(
-            Point(lon, lat),
-            crs="EPSG:4326",
-            to_crs=g_proj.graph["crs"]
-        )[0]
-    )
-    center_x, center_y = center.x, center.y
+    center_x, center_y = _wgs84_transformer(g_proj.graph["crs"]).transform(lon, lat)
 
     fig_width, fig_height = fig.get_size_inches()
     aspect = fig_width / fig_height
@@ -467,9 +1050,8 @@ def fetch_graph(point, dist) -> MultiDiGraph | None:
         return cast(MultiDiGraph, cached)
 
     try:
-        g = ox.graph_from_point(point, dist=dist, dist_type='bbox', network_type='all', truncate_by_edge=True)
-        # Rate limit between requests
-        time.sleep(0.5)
+        with _OVERPASS_SLOTS:
+            g = ox.graph_from_point(point, dist=dist, dist_type='bbox', network_type='all', truncate_by_edge=True)
         try:
             cache_set(graph, g)
         except CacheError as e:
@@ -480,6 +1062,35 @@ def fetch_graph(point, dist) -> MultiDiGraph | None:
         return None
 
 
+def _features_cache_key(point, dist, tags, name):
+    """Cache key of a feature layer, shared by fetch_features() and fetch_feature_layers()."""
+    lat, lon = point
+    tag_str = "_".join(tags.keys())
+    return f"{name}_{lat}_{lon}_{dist}_{tag_str}"
+
+
+def _matches_tags(gdf, tags):
+    """
+    Boolean mask of the features matching an OSM tag query.
+
+    Mirrors the query semantics of ox.features_from_point(): a feature
+    matches when any key matches, True meaning "tag present", a string an
+    exact value and a list any of its values.
+    """
+    mask = np.zeros(len(gdf), dtype=bool)
+    for key, value in tags.items():
+        if key not in gdf.columns:
+            continue
+        column = gdf[key]
+        if value is True:
+            mask |= column.notna().to_numpy()
+        elif isinstance(value, str):
+            mask |= column.eq(value).to_numpy()
+        else:
+            mask |= column.isin(value).to_numpy()
+    return mask
+
+
 def fetch_features(point, dist, tags, name) -> GeoDataFrame | None:
     """
     Fetch geographic features (water, parks, etc.) from OpenStreetMap.
@@ -496,18 +1107,15 @@ def fetch_features(point, dist, tags, name) -> GeoDataFrame | None:
     Returns:
         GeoDataFrame of features, or None if fetch fails
     """
-    lat, lon = point
-    tag_str = "_".join(tags.keys())
-    features = f"{name}_{lat}_{lon}_{dist}_{tag_str}"
+    features = _features_cache_key(point, dist, tags, name)
     cached = cache_get(features)
     if cached is not None:
         print(f"✓ Using cached {name}")
         return cast(GeoDataFrame, cached)
 
     try:
-        data = ox.features_from_point(point, tags=tags, dist=dist)
-        # Rate limit between requests
-        time.sleep(0.3)
+        with _OVERPASS_SLOTS:
+            data = ox.features_from_point(point, tags=tags, dist=dist)
         try:
             cache_set(features, data)
         except CacheError as e:
@@ -518,6 +1126,251 @@ def fetch_features(point, dist, tags, name) -> GeoDataFrame | None:
         return None
 
 
+def fetch_feature_layers(point, dist, names):
+    """
+    Fetch several feature layers with a single Overpass query.
+
+    Layers already in the cache are loaded as in fetch_features(). The tag
+    queries of the remaining ones are merged into one request, and the
+    result is split back per layer (dropping the tag columns left empty) and
+    cached under each layer's own key, so adding or changing one layer's
+    tags only refetches that layer. If the merged request fails, each
+    missing layer is fetched on its own with fetch_features().
+
+    Args:
+        point: (latitude, longitude) tuple for center point
+        dist: Distance in meters from center point
+        names: FEATURE_TAGS names of the layers to fetch
+
+    Returns:
+        Dict mapping each name to its GeoDataFrame, or None if that layer's
+        fetch failed
+    """
+    layers = {}
+    missing = []
+    for name in names:
+        cached = cache_get(_features_cache_key(point, dist, FEATURE_TAGS[name], name))
+        if cached is not None:
+            print(f"✓ Using cached {name}")
+            layers[name] = cast(GeoDataFrame, cached)
+        else:
+            missing.append(name)
+    if not missing:
+        return layers
+
+    merged_tags = {}
+    for name in missing:
+        for key, value in FEATURE_TAGS[name].items():
+            known = merged_tags.get(key)
+            if known is True or value is True:
+                merged_tags[key] = True
+            else:
+                values = [value] if isinstance(value, str) else list(value)
+                if known is not None:
+                    values = list(dict.fromkeys(known + values))
+                merged_tags[key] = values
+
+    try:
+        with _OVERPASS_SLOTS:
+            combined = ox.features_from_point(point, tags=merged_tags, dist=dist)
+    except Exception as e:
+        # One failing (or timing out) layer must not take the others down:
+        # fall back to one request per layer, as before the merge
+        print(f"OSMnx error while fetching merged features: {e}")
+        for name in missing:
+            layers[name] = fetch_features(point, dist, FEATURE_TAGS[name], name)
+        return layers
+
+    for name in missing:
+        tags = FEATURE_TAGS[name]
+        data = combined[_matches_tags(combined, tags)]
+        empty_columns = [
+            column for column in data.columns
+            if column != data.geometry.name and data[column].isna().all()
+        ]
+        # Keep the geometry column (and CRS) even when the split is empty,
+        # so cached layers stay GeoDataFrames as in fetch_features()
+        data = data.drop(columns=empty_columns)
+        try:
+            cache_set(_features_cache_key(point, dist, tags, name), data)
+        except CacheError as e:
+            print(e)
+        layers[name] = data
+    return layers
+
+
+# Water polygons carrying one of these place/water/natural values are open
+# sea already painted by the maritime layer, and are dropped from the
+# water layer.
+SEA_WATER_TAGS = ("sea", "ocean", "bay", "strait")
+
+# OSM tag queries for each feature layer, keyed by the cache/layer name
+# passed to fetch_features().
+FEATURE_TAGS = {
+    # Ces polygones couvrent toute la zone administrative (ville/commune)
+    # et garantissent que les zones terrestres non-taguées apparaissent
+    # comme terre et non comme mer (via le rectangle coastline)
+    "admin_boundaries": {
+        "boundary": "administrative",
+        "admin_level": ["4", "5", "6", "7", "8", "9", "10"],  # Niveaux régionaux à locaux
+    },
+    "landuse": {
+        # Utiliser True pour capturer TOUS les types de landuse
+        # Cela évite que des zones terrestres non-catégorisées
+        # apparaissent bleues (couvertes par le rectangle coastline)
+        "landuse": True,
+        "natural": ["scrub", "grassland", "wood", "heath", "sand", "beach", "bare_rock", "scree", "shingle", "fell"],
+        "place": ["island"],
+        # Ajouter leisure pour les zones récréatives
+        "leisure": True,
+    },
+    # Historically we requested a very broad set of tags here including
+    # ``place=ocean`` and ``water=sea``.  Those queries would return large
+    # polygons representing whole seas or bays, which then painted over
+    # otherwise untagged land as if it were water.  To avoid this we
+    # restrict our query to inland water bodies and riverbanks only.
+    #
+    # See https://wiki.openstreetmap.org/wiki/Tag:natural%3Dwater for
+    # details on the ``natural=water`` tag and
+    # https://wiki.openstreetmap.org/wiki/Tag:waterway=riverbank for
+    # riverbanks.  We deliberately omit ``place=sea`` and ``water=sea`` as
+    # those refer to the open ocean and should be rendered via the
+    # coastline/sea background instead.  This change prevents the
+    # inadvertent flooding of unclassified land areas reported in
+    # OSM_WATER_RENDERING_ISSUE.md.
+    "water": {
+        # ``natural=water`` covers lakes, reservoirs, ponds and other
+        # inland water bodies.  We exclude bay/strait here to avoid
+        # giant coastal polygons.
+        "natural": "water",
+        # ``waterway=riverbank`` represents the area occupied by a river.
+        "waterway": "riverbank",
+        # ``water`` keys enumerate only inland or man‑made water types.
+        # We intentionally leave out "sea", "ocean", "bay" and
+        # "strait" so that those are handled by the coastline logic.
+        "water": ["lake", "river", "pond", "reservoir", "lagoon", "canal"],
+    },
+    "parks": {"leisure": "park", "landuse": "grass"},
+    "railways": {
+        "railway": ["rail", "subway", "light_rail", "tram", "narrow_gauge"],
+    },
+    "buildings": {"building": True},
+    "coastline": {"natural": "coastline"},
+    # Ces polygones marquent explicitement les zones maritimes dans OSM
+    "maritime_boundaries": {"boundary": "maritime"},
+}
+
+
+def compensated_distance(dist, width, height):
+    """
+    Fetch radius that still covers the requested radius after the viewport
+    is cropped to the poster aspect ratio.
+    """
+    return dist * (max(height, width) / min(height, width)) / 4
+
+
+# Progress bar weight of each download in create_poster()
+_FETCH_PROGRESS = {"graph": 1, "admin_boundaries": 0.5, "coastline": 0}
+
+
+def fetch_map_data(point, dist, pbar=None):
+    """
+    Fetch the street network and every feature layer concurrently.
+
+    The street network and the feature layers (one combined Overpass query,
+    see fetch_feature_layers()) are downloaded on two threads, each taking
+    one of the OVERPASS_CONCURRENCY request slots. Maritime boundaries are
+    not included since they are only needed for coastal areas.
+
+    Args:
+        point: (latitude, longitude) tuple for map center
+        dist: Fetch radius in meters (see compensated_distance())
+        pbar: Optional tqdm progress bar, advanced as downloads complete
+
+    Returns:
+        (graph, layers) where layers maps FEATURE_TAGS names to GeoDataFrames
+        (or None when a fetch failed)
+
+    Raises:
+        RuntimeError: If street network data cannot be retrieved
+    """
+    names = [name for name in FEATURE_TAGS if name != "maritime_boundaries"]
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        graph_future = executor.submit(fetch_graph, point, dist)
+        features_future = executor.submit(fetch_feature_layers, point, dist, names)
+
+        for future in as_completed((graph_future, features_future)):
+            done = ["graph"] if future is graph_future else names
+            for name in done:
+                if pbar is not None:
+                    pbar.set_description(f"Downloaded {name.replace('_', ' ')}")
+                    pbar.update(_FETCH_PROGRESS.get(name, 1))
+
+    g = graph_future.result()
+    layers = features_future.result()
+    if g is None:
+        raise RuntimeError("Failed to retrieve street network data.")
+    return g, layers
+
+
+def fetch_maritime_async(point, dist):
+    """
+    Start fetching the maritime boundaries on a background thread.
+
+    Only coastal areas need this layer, which is known once the coastline
+    has been fetched with the other layers. Starting it then lets the
+    download overlap with projecting and drawing the rest of the map.
+
+    Args:
+        point: (latitude, longitude) tuple for map center
+        dist: Fetch radius in meters (see compensated_distance())
+
+    Returns:
+        Future resolving to the maritime GeoDataFrame (or None), as
+        returned by fetch_features()
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(
+        fetch_features, point, dist, tags=FEATURE_TAGS["maritime_boundaries"], name="maritime_boundaries"
+    )
+    # The running fetch completes; the thread exits once it is done
+    executor.shutdown(wait=False)
+    return future
+
+
+def prefetch_map_data(point, dist, width=12, height=16):
+    """
+    Fetch (or load from cache) every OSM layer create_poster() needs,
+    and project the street network (and, for coastal areas, the land
+    polygons) and group its roads once.
+
+    Call this once before rendering several posters of the same area
+    (e.g. all themes) so the download happens a single time and worker
+    processes forked afterwards inherit the data already in memory.
+
+    Args:
+        point: (latitude, longitude) tuple for map center
+        dist: Map radius in meters, as passed to create_poster()
+        width: Poster width in inches
+        height: Poster height in inches
+
+    Raises:
+        RuntimeError: If street network data cannot be retrieved
+    """
+    compensated_dist = compensated_distance(dist, width, height)
+    g, layers = fetch_map_data(point, compensated_dist)
+    g_proj = cached_projection(_projection_key("graph", point, compensated_dist), lambda: project_graph_to_utm(g))
+    # Memoized on the graph object, which forked workers share
+    get_edge_draw_data(g_proj, _projection_key("edges", point, compensated_dist))
+    # Land polygons and maritime boundaries are only used for coastal
+    # areas, as in create_poster()
+    coastline = layers["coastline"]
+    if coastline is not None and not coastline.empty:
+        maritime_future = fetch_maritime_async(point, compensated_dist)
+        load_projected_land(point, compensated_dist, g_proj.graph["crs"])
+        maritime_future.result()
+
+
 def create_poster(
     city,
     country,
@@ -533,6 +1386,12 @@ def create_poster(
     display_country=None,
     fonts=None,
     gradient_height=0.25,
+    png_compress_level=6,
+    theme=None,
+    dpi=300,
+    draft=False,
+    fig=None,
+    rasterize=True,
 ):
     """
     Generate a complete map poster with roads, water, parks, and typography.
@@ -545,17 +1404,38 @@ def create_poster(
         country: Country name for display on poster
         point: (latitude, longitude) tuple for map center
         dist: Map radius in meters
-        output_file: Path where poster will be saved
+        output_file: Path where poster will be saved (or a binary file-like object)
         output_format: File format ('png', 'svg', or 'pdf')
         width: Poster width in inches (default: 12)
         height: Poster height in inches (default: 16)
         country_label: Optional override for country text on poster
         _name_label: Optional override for city name (unused, reserved for future use)
         gradient_height: Height of top/bottom gradient fade as fraction (0.0-0.5, default: 0.25 = 25%)
+        png_compress_level: zlib level for PNG output (0-9, default: 6). Lower is faster to
+            encode but produces larger files; useful for throwaway/benchmark renders.
+        theme: Theme dict or theme name to render with. Defaults to the module-level
+            THEME; passing it explicitly keeps concurrent renders in one process independent.
+        dpi: Raster resolution for PNG output (default: 300). Lower values (e.g. 150)
+            shrink the Agg buffer quadratically for quick drafts.
+        draft: Save PNG output as a 256-color palette image instead of full RGBA.
+            Roughly 2x faster to encode and 4x smaller, at the cost of slight color
+            banding in gradients; meant for throwaway renders such as benchmarks.
+        fig: Optional existing Figure to draw into. It is cleared and resized on entry
+            and left open afterwards, so a sequential loop can keep one Agg canvas
+            alive across posters instead of allocating a new one each time. The
+            caller closes it when done.
+        rasterize: For SVG/PDF output, flatten the map layers into a single image at
+            dpi while gradients and text stay vector (default: True). Dense road
+            networks otherwise become hundreds of thousands of vector paths.
 
     Raises:
         RuntimeError: If street network data cannot be retrieved
     """
+    if theme is None:
+        theme = THEME
+    elif isinstance(theme, str):
+        theme = load_theme(theme)
+
     # Handle display names for i18n support
     # Priority: display_city/display_country > name_label/country_label > city/country
     display_city = display_city or name_label or city
@@ -570,152 +1450,87 @@ def create_poster(
         unit="step",
         bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
     ) as pbar:
-        # 1. Fetch Street Network
-        pbar.set_description("Downloading street network")
-        compensated_dist = dist * (max(height, width) / min(height, width)) / 4  # To compensate for viewport crop
-        g = fetch_graph(point, compensated_dist)
-        if g is None:
-            raise RuntimeError("Failed to retrieve street network data.")
-        pbar.update(1)
-
-        # 1.5 Fetch Administrative Boundaries (limites administratives)
-        # Ces polygones couvrent toute la zone administrative (ville/commune)
-        # et garantissent que les zones terrestres non-taguées apparaissent
-        # comme terre et non comme mer (via le rectangle coastline)
-        pbar.set_description("Downloading administrative boundaries")
-        admin_boundaries = fetch_features(
-            point,
-            compensated_dist,
-            tags={
-                "boundary": "administrative",
-                "admin_level": ["4", "5", "6", "7", "8", "9", "10"],  # Niveaux régionaux à locaux
-            },
-            name="admin_boundaries",
-        )
-        pbar.update(0.5)  # Demi-étape
-
-        # 2. Fetch Landuse/Landcover (terre)
-        pbar.set_description("Downloading land areas")
-        landuse = fetch_features(
-            point,
-            compensated_dist,
-            tags={
-                # Utiliser True pour capturer TOUS les types de landuse
-                # Cela évite que des zones terrestres non-catégorisées
-                # apparaissent bleues (couvertes par le rectangle coastline)
-                "landuse": True,
-                "natural": ["scrub", "grassland", "wood", "heath", "sand", "beach", "bare_rock", "scree", "shingle", "fell"],
-                "place": ["island"],
-                # Ajouter leisure pour les zones récréatives
-                "leisure": True,
-            },
-            name="landuse",
-        )
-        pbar.update(1)
-
-        # 3. Fetch Water (mer, océan, rivières, lacs)
-        #
-        # Historically we requested a very broad set of tags here including
-        # ``place=ocean`` and ``water=sea``.  Those queries would return large
-        # polygons representing whole seas or bays, which then painted over
-        # otherwise untagged land as if it were water.  To avoid this we
-        # restrict our query to inland water bodies and riverbanks only.
-        #
-        # See https://wiki.openstreetmap.org/wiki/Tag:natural%3Dwater for
-        # details on the ``natural=water`` tag and
-        # https://wiki.openstreetmap.org/wiki/Tag:waterway=riverbank for
-        # riverbanks.  We deliberately omit ``place=sea`` and ``water=sea`` as
-        # those refer to the open ocean and should be rendered via the
-        # coastline/sea background instead.  This change prevents the
-        # inadvertent flooding of unclassified land areas reported in
-        # OSM_WATER_RENDERING_ISSUE.md.
-        pbar.set_description("Downloading water features")
-        water_features = fetch_features(
-            point,
-            compensated_dist,
-            tags={
-                # ``natural=water`` covers lakes, reservoirs, ponds and other
-                # inland water bodies.  We exclude bay/strait here to avoid
-                # giant coastal polygons.
-                "natural": "water",
-                # ``waterway=riverbank`` represents the area occupied by a river.
-                "waterway": "riverbank",
-                # ``water`` keys enumerate only inland or man‑made water types.
-                # We intentionally leave out "sea", "ocean", "bay" and
-                # "strait" so that those are handled by the coastline logic.
-                "water": ["lake", "river", "pond", "reservoir", "lagoon", "canal"],
-            },
-            name="water",
-        )
-        pbar.update(1)
-
-        # 4. Fetch Parks
-        pbar.set_description("Downloading parks/green spaces")
-        parks = fetch_features(
-            point,
-            compensated_dist,
-            tags={"leisure": "park", "landuse": "grass"},
-            name="parks",
-        )
-        pbar.update(1)
-
-        # 5. Fetch Railways
-        pbar.set_description("Downloading railways")
-        railways = fetch_features(
-            point,
-            compensated_dist,
-            tags={
-                "railway": ["rail", "subway", "light_rail", "tram", "narrow_gauge"],
-            },
-            name="railways",
-        )
-        pbar.update(1)
-
-        # 6. Fetch Buildings
-        pbar.set_description("Downloading buildings")
-        buildings = fetch_features(
-            point,
-            compensated_dist,
-            tags={"building": True},
-            name="buildings",
-        )
-        pbar.update(1)
+        # Street network + layers (limites administratives, terre, eau,
+        # parcs, voies ferrées, bâtiments, coastline) téléchargés en parallèle
+        pbar.set_description("Downloading map data")
+        compensated_dist = compensated_distance(dist, width, height)
+        g, layers = fetch_map_data(point, compensated_dist, pbar)
+
+    admin_boundaries = layers["admin_boundaries"]
+    landuse = layers["landuse"]
+    water_features = layers["water"]
+    parks = layers["parks"]
+    railways = layers["railways"]
+    buildings = layers["buildings"]
+    coastline = layers["coastline"]
+    # Coastal areas also need the maritime boundaries (drawn at layer 0.6):
+    # download them while the other layers are projected and drawn
+    maritime_future = None
+    if coastline is not None and not coastline.empty:
+        maritime_future = fetch_maritime_async(point, compensated_dist)
 
     print("✓ All data retrieved successfully!")
 
     # 2. Setup Plot
     print("Rendering map...")
-    fig, ax = plt.subplots(figsize=(width, height), facecolor=THEME["bg"])
-    ax.set_facecolor(THEME["bg"])
+    close_figure = fig is None
+    if fig is None:
+        fig, ax = plt.subplots(figsize=(width, height), facecolor=theme["bg"])
+    else:
+        fig.set_size_inches(width, height)
+        fig.set_facecolor(theme["bg"])
+        if len(fig.axes) == 1:
+            # Clearing the previous poster's Axes is cheaper than rebuilding one;
+            # cla() keeps the rasterization threshold, so reset it explicitly
+            ax = fig.axes[0]
+            ax.cla()
+            ax.set_rasterization_zorder(None)
+        else:
+            fig.clf()
+            ax = fig.add_subplot()
+    ax.set_facecolor(theme["bg"])
     ax.set_position((0.0, 0.0, 1.0, 1.0))
 
     # Project graph to a metric CRS so distances and aspect are linear (meters)
-    g_proj = ox.project_graph(g)
+    # Projection is theme-independent: cached per area (memory + disk)
+    g_proj = cached_projection(_projection_key("graph", point, compensated_dist), lambda: project_graph_to_utm(g))
+    map_crs = g_proj.graph["crs"]
 
     # Get crop limits to determine map bounds
     crop_xlim, crop_ylim = get_crop_limits(g_proj, point, fig, compensated_dist)
 
+    # Polygon detail below half an output pixel (in meters) is invisible,
+    # so layers are simplified to it before plotting; background land
+    # polygons tolerate a full pixel
+    simplify_tolerance = (crop_xlim[1] - crop_xlim[0]) / (width * dpi) / 2
+
     # 3. Plot Layers
-    # Layer -1: Coastline detection and sea background
-    # Télécharger la coastline pour détecter les zones côtières
-    coastline = fetch_features(
-        point,
-        compensated_dist,
-        tags={"natural": "coastline"},
-        name="coastline"
+    # Feature layers are projected together, in the same CRS as the graph
+    projected = project_layers(
+        {
+            "landuse": lambda: _polygons(landuse),
+            "buildings": lambda: _polygons(buildings),
+            "water": lambda: _water_polygons(water_features),
+            # Polygons only, to avoid point features showing as dots
+            "parks": lambda: _polygons(parks),
+            "railways": lambda: _lines(railways),
+        },
+        map_crs, point, compensated_dist,
     )
 
+    # Layer -1: Coastline detection and sea background
+    # La coastline (téléchargée avec les autres couches) détecte les zones côtières
     # Si on est près d'une côte, ajouter un fond bleu dans la zone viewport
-    if coastline is not None and not coastline.empty:
+    has_sea = coastline is not None and not coastline.empty
+    if has_sea:
         # Rectangle bleu pour la mer, limité à la zone visible
-        from matplotlib.patches import Rectangle
         x_min, x_max = crop_xlim
         y_min, y_max = crop_ylim
         sea_rect = Rectangle(
             (x_min, y_min),
             x_max - x_min,
             y_max - y_min,
-            facecolor=THEME['water'],
+            facecolor=theme['water'],
             edgecolor='none',
             zorder=-1
         )
@@ -725,88 +1540,73 @@ def create_poster(
     # Ces polygones proviennent d'OSM et définissent précisément les zones terrestres
     # vs maritimes dans le monde entier. Cela garantit que seules les vraies zones
     # terrestres apparaissent en couleur terre, pas les zones maritimes.
-    land_polygons_gdf = load_land_polygons()
-    if land_polygons_gdf is not None:
-        # Extraire les polygones qui intersectent la zone visible (en WGS84)
-        # Convertir crop limits vers WGS84 pour la requête
-        import geopandas as gpd
-        from shapely.geometry import Point as ShapelyPoint
-
-        # Obtenir la bbox en lat/lon (WGS84)
-        # g_proj est en projection métrique, on doit retourner à WGS84
-        x_min, x_max = crop_xlim
-        y_min, y_max = crop_ylim
-
-        # Créer une bbox légèrement agrandie pour être sûr de tout capturer
-        margin = 0.05  # ~5km de marge
-        lon_min, lon_max = point[1] - margin, point[1] + margin
-        lat_min, lat_max = point[0] - margin, point[0] + margin
-
-        print(f"🌍 Extracting land polygons for bbox ({lat_min:.3f}, {lon_min:.3f}) to ({lat_max:.3f}, {lon_max:.3f})")
-        land_subset = land_polygons_gdf.cx[lon_min:lon_max, lat_min:lat_max].copy()
-
-        if not land_subset.empty:
-            print(f"✓ {len(land_subset)} land polygons found in area")
-            # Projeter dans le CRS de la carte
-            try:
-                land_subset = land_subset.to_crs(g_proj.graph['crs'])
-            except Exception:
-                land_subset = ox.projection.project_gdf(land_subset)
-
-            # Dessiner les zones terrestres
-            land_subset.plot(ax=ax, facecolor=THEME['bg'], edgecolor='none', zorder=-0.3)
-            print(f"🗺️  Rendered {len(land_subset)} land polygons")
+    # La terre est dessinée avec la couleur de fond: elle n'est visible que
+    # par-dessus le rectangle de mer. Sans côte, ou si le landuse (même
+    # couleur, au-dessus) couvre déjà tout le viewport, la couche est
+    # entièrement masquée et n'est ni lue ni dessinée.
+    landuse_polys = projected.get("landuse")
+
+    draw_land = has_sea
+    if draw_land and landuse_polys is not None and covers_viewport(landuse_polys, crop_xlim, crop_ylim):
+        print("✓ Landuse covers the viewport, skipping land polygons")
+        draw_land = False
+
+    if draw_land:
+        # Polygones de la zone, déjà projetés (lus une seule fois par zone)
+        land_subset = load_projected_land(point, compensated_dist, map_crs)
+        if land_subset is not None:
+            lon_min, lat_min, lon_max, lat_max = land_bbox(point, compensated_dist)
+            x_min, x_max = crop_xlim
+            y_min, y_max = crop_ylim
+
+            print(f"🌍 Extracting land polygons for bbox ({lat_min:.3f}, {lon_min:.3f}) to ({lat_max:.3f}, {lon_max:.3f})")
+
+            if not land_subset.empty:
+                print(f"✓ {len(land_subset)} land polygons found in area")
+
+                # Dessiner les zones terrestres
+                simplify_for_display(land_subset, 2 * simplify_tolerance).plot(ax=ax, facecolor=theme['bg'], edgecolor='none', zorder=-0.3)
+                print(f"🗺️  Rendered {len(land_subset)} land polygons")
+            else:
+                print(f"⚠️  No land polygons in area (likely inland - drawing fallback rectangle)")
+                # Fallback: rectangle terre si pas de land polygons trouvés
+                land_rect = Rectangle(
+                    (x_min, y_min),
+                    x_max - x_min,
+                    y_max - y_min,
+                    facecolor=theme['bg'],
+                    edgecolor='none',
+                    zorder=-0.3
+                )
+                ax.add_patch(land_rect)
         else:
-            print(f"⚠️  No land polygons in area (likely inland - drawing fallback rectangle)")
-            # Fallback: rectangle terre si pas de land polygons trouvés
-            from matplotlib.patches import Rectangle
+            print(f"⚠️  Land polygons not available, using fallback rectangle")
+            # Fallback: rectangle terre simple
+            x_min, x_max = crop_xlim
+            y_min, y_max = crop_ylim
             land_rect = Rectangle(
                 (x_min, y_min),
                 x_max - x_min,
                 y_max - y_min,
-                facecolor=THEME['bg'],
+                facecolor=theme['bg'],
                 edgecolor='none',
                 zorder=-0.3
             )
             ax.add_patch(land_rect)
-    else:
-        print(f"⚠️  Land polygons not available, using fallback rectangle")
-        # Fallback: rectangle terre simple
-        from matplotlib.patches import Rectangle
-        x_min, x_max = crop_xlim
-        y_min, y_max = crop_ylim
-        land_rect = Rectangle(
-            (x_min, y_min),
-            x_max - x_min,
-            y_max - y_min,
-            facecolor=THEME['bg'],
-            edgecolor='none',
-            zorder=-0.3
-        )
-        ax.add_patch(land_rect)
 
     # Layer 0.6: Zones maritimes (boundary=maritime)
     # Ces polygones marquent explicitement les zones maritimes dans OSM
-    if coastline is not None and not coastline.empty:
+    if maritime_future is not None:
         try:
-            maritime = fetch_features(
-                point,
-                compensated_dist,
-                tags={"boundary": "maritime"},
-                name="maritime_boundaries"
-            )
+            maritime = maritime_future.result()
             if maritime is not None and not maritime.empty:
                 print(f"🔍 Maritime: {len(maritime)} features, types: {maritime.geometry.type.value_counts().to_dict()}")
-                maritime_polys = maritime[maritime.geometry.type.isin(["Polygon", "MultiPolygon"])].copy()
-                if not maritime_polys.empty:
-                    # Projeter
-                    try:
-                        maritime_polys = ox.projection.project_gdf(maritime_polys)
-                    except Exception:
-                        maritime_polys = maritime_polys.to_crs(g_proj.graph['crs'])
-
+                maritime_polys = project_layers(
+                    {"maritime": lambda: _polygons(maritime)}, map_crs, point, compensated_dist
+                ).get("maritime")
+                if maritime_polys is not None:
                     # Dessiner les zones maritimes en bleu
-                    maritime_polys.plot(ax=ax, facecolor=THEME['water'], edgecolor='none', zorder=0.6)
+                    simplify_for_display(maritime_polys, simplify_tolerance).plot(ax=ax, facecolor=theme['water'], edgecolor='none', zorder=0.6)
                     print(f"🌊  Rendered {len(maritime_polys)} maritime boundary polygons")
                 else:
                     print(f"⚠️  Maritime boundaries found but no polygons (likely LineStrings)")
@@ -814,113 +1614,66 @@ def create_poster(
             print(f"⚠️  Could not fetch maritime boundaries: {e}")
 
     # Layer 0: Landuse/Landcover (terre) - protège le fond bleu
-    if landuse is not None and not landuse.empty:
-        landuse_polys = landuse[landuse.geometry.type.isin(["Polygon", "MultiPolygon"])]
-        if not landuse_polys.empty:
-            try:
-                landuse_polys = ox.projection.project_gdf(landuse_polys)
-            except Exception:
-                landuse_polys = landuse_polys.to_crs(g_proj.graph['crs'])
-            # Dessiner la terre avec la couleur de fond (bg)
-            landuse_polys.plot(ax=ax, facecolor=THEME['bg'], edgecolor='none', zorder=0)
+    if landuse_polys is not None:
+        # Dessiner la terre avec la couleur de fond (bg)
+        simplify_for_display(landuse_polys, simplify_tolerance).plot(ax=ax, facecolor=theme['bg'], edgecolor='none', zorder=0)
 
     # Layer 0.4: Buildings (bâtiments)
     # Dessiner les bâtiments avec une couleur légèrement plus claire que le fond
-    if buildings is not None and not buildings.empty:
-        building_polys = buildings[buildings.geometry.type.isin(["Polygon", "MultiPolygon"])].copy()
-        if not building_polys.empty:
-            try:
-                building_polys = ox.projection.project_gdf(building_polys)
-            except Exception:
-                building_polys = building_polys.to_crs(g_proj.graph['crs'])
-
-            buildings_color = THEME.get('buildings', THEME['bg'])
-            building_polys.plot(ax=ax, facecolor=buildings_color, edgecolor='none', zorder=0.4)
-            print(f"🏢 Rendered {len(building_polys)} buildings")
+    building_polys = projected.get("buildings")
+    if building_polys is not None:
+        buildings_color = theme.get('buildings', theme['bg'])
+        plot_polygons(ax, simplify_for_display(building_polys, simplify_tolerance), buildings_color, zorder=0.4)
+        print(f"🏢 Rendered {len(building_polys)} buildings")
 
     # Layer 1: Water (mer, océan, rivières, lacs) - même couleur theme['water']
-    if water_features is not None and not water_features.empty:
-        # Retain only polygonal geometries
-        water_polys = water_features[water_features.geometry.type.isin(["Polygon", "MultiPolygon"])].copy()
-        print(f"🔍 DEBUG: {len(water_polys)} water polygons before filtering")
-        print(f"🔍 DEBUG: Columns available: {water_polys.columns.tolist()}")
-        if not water_polys.empty:
-            # Show some examples of what we have
-            for col in ["place", "water", "natural"]:
-                if col in water_polys.columns:
-                    unique_vals = water_polys[col].dropna().unique()[:10]
-                    print(f"🔍 DEBUG: {col} values: {unique_vals.tolist()}")
-
-            # Filter out any large sea/ocean/bay polygons that might have slipped
-            # through.  This guards against tag inconsistencies where a
-            # multipolygon may still carry an undesired water type.
-            for col in ["place", "water", "natural"]:
-                if col in water_polys.columns:
-                    water_polys = water_polys[~water_polys[col].isin([
-                        "sea", "ocean", "bay", "strait"
-                    ])]
-            print(f"🔍 DEBUG: {len(water_polys)} water polygons after filtering")
-            if not water_polys.empty:
-                try:
-                    water_polys = ox.projection.project_gdf(water_polys)
-                except Exception:
-                    water_polys = water_polys.to_crs(g_proj.graph['crs'])
-                water_polys.plot(ax=ax, facecolor=THEME['water'], edgecolor='none', zorder=0.5)
-
-    if parks is not None and not parks.empty:
-        # Filter to only polygon/multipolygon geometries to avoid point features showing as dots
-        parks_polys = parks[parks.geometry.type.isin(["Polygon", "MultiPolygon"])]
-        if not parks_polys.empty:
-            # Project park features in the same CRS as the graph
-            try:
-                parks_polys = ox.projection.project_gdf(parks_polys)
-            except Exception:
-                parks_polys = parks_polys.to_crs(g_proj.graph['crs'])
-            parks_polys.plot(ax=ax, facecolor=THEME['parks'], edgecolor='none', zorder=0.8)
+    # Eau et parcs: une seule path par couche, comme les bâtiments (les
+    # polygones adjacents ne laissent plus de joint anti-aliasé entre eux)
+    water_polys = projected.get("water")
+    if water_polys is not None:
+        plot_polygons(ax, simplify_for_display(water_polys, simplify_tolerance), theme['water'], zorder=0.5)
+
+    parks_polys = projected.get("parks")
+    if parks_polys is not None:
+        plot_polygons(ax, simplify_for_display(parks_polys, simplify_tolerance), theme['parks'], zorder=0.8)
     # Layer 2: Roads with hierarchy coloring
     print("Applying road hierarchy colors...")
-    edge_colors = get_edge_colors_by_type(g_proj)
-    edge_widths = get_edge_widths_by_type(g_proj)
+    road_groups = get_edge_draw_data(g_proj, _projection_key("edges", point, compensated_dist))
 
     # Determine cropping limits to maintain the poster aspect ratio
     crop_xlim, crop_ylim = get_crop_limits(g_proj, point, fig, compensated_dist)
 
-    # Plot the projected graph and then apply the cropped limits
-    ox.plot_graph(
-        g_proj, ax=ax, bgcolor=THEME['bg'],
-        node_size=0,
-        edge_color=edge_colors,
-        edge_linewidth=edge_widths,
-        show=False,
-        close=False,
-    )
+    # Plot the projected graph as one LineCollection per road class and
+    # then apply the cropped limits
+    for road_class, road_width, segments in road_groups:
+        ax.add_collection(
+            LineCollection(segments, colors=theme[road_class], linewidths=road_width, zorder=1), autolim=False
+        )
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.get_xaxis().set_visible(False)
+    ax.get_yaxis().set_visible(False)
     ax.set_aspect("equal", adjustable="box")
     ax.set_xlim(crop_xlim)
     ax.set_ylim(crop_ylim)
 
     # Layer 3.5: Railways (voies ferrées)
     # Dessiner les voies ferrées avec une ligne plus épaisse que les routes
-    if railways is not None and not railways.empty:
-        railway_lines = railways[railways.geometry.type.isin(["LineString", "MultiLineString"])].copy()
-        if not railway_lines.empty:
-            try:
-                railway_lines = ox.projection.project_gdf(railway_lines)
-            except Exception:
-                railway_lines = railway_lines.to_crs(g_proj.graph['crs'])
-
-            # Utiliser la même couleur que les routes primaires, mais plus épais
-            railway_color = THEME.get('road_primary', THEME['text'])
-            railway_lines.plot(
-                ax=ax,
-                color=railway_color,
-                linewidth=1.8,  # Plus épais que les routes
-                zorder=3.5,  # Au-dessus des routes
-            )
-            print(f"🚂 Rendered {len(railway_lines)} railway lines")
+    railway_lines = projected.get("railways")
+    if railway_lines is not None:
+        # Utiliser la même couleur que les routes primaires, mais plus épais
+        railway_color = theme.get('road_primary', theme['text'])
+        railway_lines.plot(
+            ax=ax,
+            color=railway_color,
+            linewidth=1.8,  # Plus épais que les routes
+            zorder=3.5,  # Au-dessus des routes
+        )
+        print(f"🚂 Rendered {len(railway_lines)} railway lines")
 
     # Layer 3: Gradients (Top and Bottom)
-    create_gradient_fade(ax, THEME['gradient_color'], location='bottom', zorder=10, height=gradient_height)
-    create_gradient_fade(ax, THEME['gradient_color'], location='top', zorder=10, height=gradient_height)
+    create_gradient_fade(ax, theme['gradient_color'], location='bottom', zorder=10, height=gradient_height)
+    create_gradient_fade(ax, theme['gradient_color'], location='top', zorder=10, height=gradient_height)
 
     # Calculate scale factor based on smaller dimension (reference 12 inches)
     # This ensures text scales properly for both portrait and landscape orientations
@@ -933,6 +1686,8 @@ def create_poster(
     base_attr = 8
 
     # 4. Typography - use custom fonts if provided, otherwise use default FONTS
+    # FontProperties only stores the path: matplotlib parses each font file once
+    # per process (font_manager.get_font is cached), so these are cheap to rebuild
     active_fonts = fonts or FONTS
     if active_fonts:
         # font_main is calculated dynamically later based on length
@@ -960,7 +1715,7 @@ def create_poster(
     # Non-Latin scripts (CJK, Thai, Arabic, etc.): no spacing, preserve case structure
     if is_latin_script(display_city):
         # Latin script: uppercase with letter spacing (e.g., "P  A  R  I  S")
-        spaced_city = "  ".join(list(display_city.upper()))
+        spaced_city = "  ".join(display_city.upper())
     else:
         # Non-Latin script: no spacing, no forced uppercase
         # For scripts like Arabic, Thai, Japanese, etc.
@@ -993,7 +1748,7 @@ def create_poster(
         0.14,
         spaced_city,
         transform=ax.transAxes,
-        color=THEME["text"],
+        color=theme["text"],
         ha="center",
         fontproperties=font_main_adjusted,
         zorder=11,
@@ -1004,7 +1759,7 @@ def create_poster(
         0.10,
         display_country.upper(),
         transform=ax.transAxes,
-        color=THEME["text"],
+        color=theme["text"],
         ha="center",
         fontproperties=font_sub,
         zorder=11,
@@ -1024,7 +1779,7 @@ def create_poster(
         0.07,
         coords,
         transform=ax.transAxes,
-        color=THEME["text"],
+        color=theme["text"],
         alpha=0.7,
         ha="center",
         fontproperties=font_coords,
@@ -1035,7 +1790,7 @@ def create_poster(
         [0.4, 0.6],
         [0.125, 0.125],
         transform=ax.transAxes,
-        color=THEME["text"],
+        color=theme["text"],
         linewidth=1 * scale_factor,
         zorder=11,
     )
@@ -1051,7 +1806,7 @@ def create_poster(
         0.02,
         "© OpenStreetMap contributors",
         transform=ax.transAxes,
-        color=THEME["text"],
+        color=theme["text"],
         alpha=0.5,
         ha="right",
         va="bottom",
@@ -1060,23 +1815,61 @@ def create_poster(
     )
 
     # 5. Save
-    print(f"Saving to {output_file}...")
+    target = output_file if isinstance(output_file, (str, os.PathLike)) else "memory buffer"
+    print(f"Saving to {target}...")
 
     fmt = output_format.lower()
+    # The axes fill the whole figure (set_position above) and all text is
+    # drawn inside them, so the figure bounds are already the final bounds.
+    # bbox_inches="tight" would cost an extra draw pass just to measure
+    # artists, and grew the output past the requested size because the
+    # road collection extends outside the axes.
     save_kwargs = dict(
-        facecolor=THEME["bg"],
-        bbox_inches="tight",
-        pad_inches=0.05,
+        facecolor=theme["bg"],
     )
 
     # DPI matters mainly for raster formats
     if fmt == "png":
-        save_kwargs["dpi"] = 300
+        save_kwargs["dpi"] = dpi
+        save_kwargs["pil_kwargs"] = {"compress_level": png_compress_level}
+    elif rasterize:
+        # Every map layer sits below the gradients (zorder 10) and the text
+        # (zorder 11): they are composited into one image at the PNG
+        # resolution, the rest stays vector
+        ax.set_rasterization_zorder(10)
+        save_kwargs["dpi"] = dpi
+
+    if fmt == "png" and draft:
+        save_palette_png(fig, output_file, dpi, png_compress_level)
+    else:
+        fig.savefig(output_file, format=fmt, **save_kwargs)
 
-    plt.savefig(output_file, format=fmt, **save_kwargs)
+    if close_figure:
+        plt.close(fig)
+    print(f"✓ Done! Poster saved as {target}")
 
-    plt.close()
-    print(f"✓ Done! Poster saved as {output_file}")
+
+def save_palette_png(fig, output_file, dpi, compress_level):
+    """
+    Save a figure as an 8-bit palette PNG.
+
+    The figure is rasterized once by Agg, reduced to 256 colors with a fast
+    octree quantizer and encoded by Pillow. The DEFLATE stage then works on
+    one byte per pixel instead of four.
+
+    Args:
+        fig: Figure to save (its facecolor is used as background)
+        output_file: Path or binary file-like object
+        dpi: Raster resolution
+        compress_level: zlib level for the PNG encoder (0-9)
+    """
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    image = Image.frombuffer(
+        "RGBA", fig.canvas.get_width_height(), fig.canvas.buffer_rgba(), "raw", "RGBA", 0, 1
+    )
+    palette = image.convert("RGB").quantize(256, method=Image.Quantize.FASTOCTREE)
+    palette.save(output_file, format="PNG", optimize=False, compress_level=compress_level)
 
 
 def print_examples():
@@ -1262,6 +2055,11 @@ Examples:
         choices=["png", "svg", "pdf"],
         help="Output format for the poster (default: png)",
     )
+    parser.add_argument(
+        "--vector",
+        action="store_true",
+        help="Keep map layers as vector paths in SVG/PDF output (larger, slower to save)",
+    )
 
     args = parser.parse_args()
 
@@ -1328,8 +2126,10 @@ Examples:
         else:
             coords = get_coordinates(args.city, args.country)
 
+        # One figure for every theme: create_poster() clears and redraws it
+        fig = plt.figure()
         for theme_name in themes_to_generate:
-            THEME = load_theme(theme_name)
+            selected_theme = load_theme(theme_name)
             output_file = generate_output_filename(args.city, theme_name, args.format, args.distance)
             create_poster(
                 args.city,
@@ -1344,7 +2144,11 @@ Examples:
                 display_city=args.display_city,
                 display_country=args.display_country,
                 fonts=custom_fonts,
+                theme=selected_theme,
+                fig=fig,
+                rasterize=not args.vector,
             )
+        plt.close(fig)
 
         print("\n" + "=" * 50)
         print("✓ Poster generation complete!")
@@ -1352,7 +2156,5 @@ Examples:
 
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        import traceback
-
         traceback.print_exc()
         sys.exit(1)
@@ -100,12 +100,11 @@ def main():
     else:
         # Mode normal - génération standard
         print(f"\n📄 Mode NORMAL - Génération standard...")
-        import create_map_poster as cmp
         from create_map_poster import create_poster, load_fonts
 
         output = f"posters/{args.city.lower()}_{args.theme}_{distance}m.pdf"
 
-        cmp.THEME = load_theme_cached(args.theme)
+        theme = load_theme_cached(args.theme)
         fonts = load_fonts()
 
         start = time.time()
@@ -118,7 +117,8 @@ def main():
             output_format='pdf',
             width=11.7,
             height=16.5,
-            fonts=fonts
+            fonts=fonts,
+            theme=theme
         )
         elapsed = time.time() - start
 
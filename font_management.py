@@ -10,7 +10,7 @@ from typing import Optional
 
 import requests
 
-FONTS_DIR = "fonts"
+FONTS_DIR = str(Path(__file__).resolve().parent / "fonts")
 FONTS_CACHE_DIR = Path(FONTS_DIR) / "cache"
 
 
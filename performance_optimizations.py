@@ -32,11 +32,10 @@ def create_fast_preview(city, country, point, dist, theme, output_file):
     Génère un preview ultra-rapide en réduisant la qualité et les features
     ~5x plus rapide qu'une génération normale
     """
-    import create_map_poster as cmp
     from create_map_poster import create_poster
 
     # Charger avec cache
-    cmp.THEME = load_theme_cached(theme)
+    theme_data = load_theme_cached(theme)
     fonts = load_fonts_cached()
 
     # Résolution très réduite
@@ -49,55 +48,402 @@ def create_fast_preview(city, country, point, dist, theme, output_file):
         output_format='png',
         width=3,      # 4x plus petit
         height=4,     # 4x plus petit
-        fonts=fonts
+        fonts=fonts,
+        theme=theme_data
     )
 
 
 # Optimisation 3: Génération parallèle
-def generate_multiple_parallel(configs, max_workers=4):
+def _drop_page_cache(fd):
+    """
+    Retire du page cache les pages d'un fichier écrit une fois, jamais relu
+
+    Les posters (plusieurs Mo chacun) n'évincent ainsi pas les caches OSM et
+    polices en mémoire pendant un batch. Sans effet hors Linux/Unix.
+    """
+    import os
+
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    # DONTNEED ignore les pages sales: les écrire d'abord
+    os.fdatasync(fd)
+    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def drop_file_from_page_cache(path):
+    """Version par chemin de _drop_page_cache (pour les fichiers écrits par savefig)"""
+    import os
+
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        _drop_page_cache(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_file(path, data):
+    """Écrit data (bytes) dans path puis le retire du page cache"""
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        _drop_page_cache(f.fileno())
+
+
+class BackgroundWriter:
+    """
+    Écrit les fichiers sur disque dans un thread dédié
+
+    Le rendu suivant démarre pendant que le PNG/PDF précédent est écrit.
+    close() vide la file et attend la fin des écritures.
+    """
+
+    def __init__(self):
+        import queue
+        import threading
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="poster-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data):
+        """Met en file l'écriture de data (bytes) dans path"""
+        self._queue.put((path, data))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, data = item
+            try:
+                _write_file(path, data)
+            except OSError as e:
+                print(f"✗ Erreur écriture {path}: {e}")
+
+    def close(self):
+        """Termine les écritures en attente puis arrête le thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+# Writer du process worker courant (créé par _worker_init)
+_WORKER_WRITER = None
+
+
+def _worker_init(theme_names, background_writer=True):
+    """
+    Initializer des workers: pré-charge polices et thèmes une fois par process
+
+    Les jobs suivants du même worker trouvent les caches déjà chauds.
+    Démarre aussi le writer en arrière-plan, vidé à la sortie du worker
+    (inutile quand c'est le process parent qui écrit les fichiers).
+    """
+    global _WORKER_WRITER
+    from multiprocessing.util import Finalize
+
+    load_fonts_cached()
+    for theme_name in theme_names:
+        load_theme_cached(theme_name)
+
+    if not background_writer:
+        return
+    _WORKER_WRITER = BackgroundWriter()
+    Finalize(_WORKER_WRITER, _WORKER_WRITER.close, exitpriority=10)
+
+
+def _render(config, output_file, fig=None):
+    """Génère le poster décrit par config dans output_file (chemin ou buffer)"""
+    from create_map_poster import create_poster
+
+    theme = load_theme_cached(config['theme'])
+    fonts = load_fonts_cached()
+
+    create_poster(
+        city=config['city'],
+        country=config['country'],
+        point=config['point'],
+        dist=config['dist'],
+        output_file=output_file,
+        output_format=config.get('format', 'pdf'),
+        width=config.get('width', 12),
+        height=config.get('height', 16),
+        fonts=fonts,
+        png_compress_level=config.get('png_compress_level', 6),
+        theme=theme,
+        draft=config.get('draft', False),
+        fig=fig
+    )
+
+
+def _generate_one(config, fig=None):
+    """
+    Génère un poster (worker pour parallélisation)
+
+    Fonction au niveau module pour rester picklable par ProcessPoolExecutor.
+    Hors d'un worker initialisé, le fichier est écrit directement.
+    """
+    import io
+
+    if _WORKER_WRITER is None:
+        _render(config, config['output_file'], fig)
+    else:
+        buffer = io.BytesIO()
+        _render(config, buffer, fig)
+        _WORKER_WRITER.submit(config['output_file'], buffer.getvalue())
+    return config['output_file']
+
+
+def _generate_batch(configs):
+    """
+    Génère une série de posters d'une même zone dans un seul worker
+
+    Une seule figure matplotlib est créée puis réutilisée d'un thème à
+    l'autre, et les données de la zone (graphe projeté, segments des
+    routes) sont déjà en mémoire après le premier poster: seules les
+    couleurs changent.
+
+    Returns:
+        Liste de (output_file, message d'erreur ou None), une par config
+    """
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure()
+    results = []
+    try:
+        for config in configs:
+            try:
+                results.append((_generate_one(config, fig), None))
+            except Exception as e:
+                results.append((config['output_file'], str(e)))
+    finally:
+        plt.close(fig)
+    return results
+
+
+def _area_batches(configs, max_workers):
+    """
+    Regroupe les configs par zone en lots pour _generate_batch
+
+    Chaque zone est répartie en tourniquet sur au plus max_workers lots:
+    tous les cœurs restent occupés même pour une seule ville (--all-themes),
+    et l'ordre des configs (ex. plus longs d'abord) est conservé dans
+    chaque lot.
+    """
+    areas = {}
+    for cfg in configs:
+        key = (tuple(cfg['point']), cfg['dist'], cfg.get('width', 12), cfg.get('height', 16))
+        areas.setdefault(key, []).append(cfg)
+
+    batches = []
+    for area_configs in areas.values():
+        n_batches = min(len(area_configs), max_workers)
+        batches.extend(area_configs[i::n_batches] for i in range(n_batches))
+    return batches
+
+
+def _render_bytes(config):
+    """Génère un poster en mémoire et retourne (chemin de sortie, contenu)"""
+    import io
+
+    buffer = io.BytesIO()
+    _render(config, buffer)
+    return config['output_file'], buffer.getvalue()
+
+
+def default_workers(n_jobs, per_core=1):
+    """
+    Nombre de workers par défaut, sans dépasser le nombre de jobs
+
+    Args:
+        n_jobs: Nombre de posters à générer
+        per_core: Workers par cœur. >1 sur-souscrit les cœurs pour que l'OS
+                  masque les phases I/O (lecture cache, écriture du fichier)
+                  et la traîne de la dernière vague (au prix de plus de RAM)
+    """
+    import os
+    return max(1, min(n_jobs, (os.cpu_count() or 1) * per_core))
+
+
+def _pool_context():
+    """
+    Contexte multiprocessing des pools de rendu: fork sous Linux, sinon
+    le défaut de la plateforme (None)
+
+    Un worker forké démarre en quelques ms avec osmnx, geopandas et
+    matplotlib déjà importés, et hérite du cache mémoire rempli par
+    _prefetch_areas. forkserver (défaut Linux à partir de Python 3.14) et
+    spawn réimportent tout dans chaque worker: ~7s pour 4 workers au lieu
+    de 0.06s. Un pool persistant entre appels perdrait cet héritage, d'où
+    un pool neuf, forké après le préchargement, à chaque appel.
+    macOS garde spawn, son défaut: forker après le chargement de
+    numpy/Accelerate ou de matplotlib peut planter ou bloquer le fils.
+    """
+    import multiprocessing
+    import sys
+
+    if sys.platform.startswith('linux'):
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def server_pool_context():
+    """
+    Contexte multiprocessing des process créés depuis un serveur multi-threadé
+
+    fork n'y est pas sûr: un autre thread peut tenir un verrou (cache
+    mémoire, stdout, logging) au moment du fork, et le worker démarre avec
+    ce verrou pris pour toujours. Les workers partent ici d'un forkserver
+    mono-thread, qui a importé une fois create_map_poster et ce module: un
+    nouveau worker ne réimporte pas osmnx/geopandas/matplotlib. Il n'hérite
+    pas non plus des données en mémoire: il relit le cache disque écrit par
+    prefetch_map_data.
+    """
+    import multiprocessing
+
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    ctx = multiprocessing.get_context('forkserver')
+    ctx.set_forkserver_preload(['create_map_poster', 'performance_optimizations'])
+    return ctx
+
+
+def render_pool(theme_names, max_workers, background_writer=True, mp_context=None):
+    """
+    Pool de process de rendu, pré-chauffé
+
+    Par défaut forké sous Linux (voir _pool_context), à créer après le
+    préchargement des zones (prefetch_map_data): les workers héritent alors
+    des données OSM déjà en mémoire (ailleurs ils relisent le cache disque). Depuis un process multi-threadé, passer
+    mp_context=server_pool_context().
+
+    Args:
+        theme_names: Thèmes à pré-charger dans chaque worker
+        max_workers: Nombre de workers
+        background_writer: Démarrer un writer en arrière-plan par worker
+                           (False quand create_poster écrit lui-même le
+                           fichier ou que le parent s'en charge)
+        mp_context: Contexte multiprocessing (défaut: _pool_context())
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context or _pool_context(),
+        initializer=_worker_init,
+        initargs=(list(theme_names), background_writer),
+    )
+
+
+def _prefetch_areas(configs):
+    """
+    Télécharge/charge les données OSM une seule fois par zone dans le
+    process parent: évite N téléchargements concurrents à froid, et les
+    workers (fork, sous Linux) héritent du cache mémoire au lieu de relire
+    le disque
+    """
+    from create_map_poster import prefetch_map_data
+
+    areas = {
+        (tuple(cfg['point']), cfg['dist'], cfg.get('width', 12), cfg.get('height', 16))
+        for cfg in configs
+    }
+    for point, dist, width, height in areas:
+        prefetch_map_data(point, dist, width, height)
+
+
+def generate_multiple_parallel(configs, max_workers=None):
     """
     Génère plusieurs posters en parallèle
 
+    Les posters d'une même zone sont regroupés en lots (voir _area_batches):
+    un worker rend son lot avec une seule figure, en ne recalculant que les
+    couleurs d'un thème à l'autre. Les lots sont consommés via as_completed:
+    un worker libéré reprend immédiatement le lot suivant. Chaque worker
+    écrit ses fichiers en arrière-plan; tous sont sur disque au retour de la
+    fonction.
+
     Args:
         configs: Liste de dicts avec {city, country, point, dist, theme, output_file, format}
-        max_workers: Nombre de workers parallèles
-    """
-    from concurrent.futures import ProcessPoolExecutor, as_completed
-    from create_map_poster import create_poster, load_theme, load_fonts
-    import create_map_poster as cmp
-
-    def generate_one(config):
-        """Génère un poster (pour parallélisation)"""
-        import create_map_poster as cmp
-        from create_map_poster import create_poster, load_theme, load_fonts
-
-        cmp.THEME = load_theme(config['theme'])
-        fonts = load_fonts()
-
-        create_poster(
-            city=config['city'],
-            country=config['country'],
-            point=config['point'],
-            dist=config['dist'],
-            output_file=config['output_file'],
-            output_format=config.get('format', 'pdf'),
-            width=config.get('width', 12),
-            height=config.get('height', 16),
-            fonts=fonts
-        )
-        return config['output_file']
+                 (optionnel: width, height, png_compress_level, draft)
+        max_workers: Nombre de workers parallèles (défaut: default_workers(len(configs)))
+    """
+    from concurrent.futures import as_completed
+
+    if max_workers is None:
+        max_workers = default_workers(len(configs))
+
+    _prefetch_areas(configs)
+    theme_names = sorted({cfg['theme'] for cfg in configs})
 
     results = []
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(generate_one, cfg): cfg for cfg in configs}
+    with render_pool(theme_names, max_workers) as executor:
+        futures = [executor.submit(_generate_batch, batch) for batch in _area_batches(configs, max_workers)]
 
         for future in as_completed(futures):
             try:
-                result = future.result()
-                results.append(result)
-                print(f"✓ Généré: {result}")
+                batch_results = future.result()
             except Exception as e:
                 print(f"✗ Erreur: {e}")
+                continue
+            for result, error in batch_results:
+                if error is None:
+                    results.append(result)
+                    print(f"✓ Généré: {result}")
+                else:
+                    print(f"✗ Erreur: {error}")
+
+    return results
+
+
+async def generate_multiple_parallel_async(configs, max_workers=None):
+    """
+    Variante asyncio de generate_multiple_parallel (maître/écrivain)
+
+    Les workers ne font que le rendu et renvoient le fichier en mémoire;
+    le process parent l'écrit sur un pool de threads I/O dès qu'un poster
+    est prêt, pendant que les workers continuent les rendus suivants.
+    Aucun cœur de calcul ne passe de temps dans les write().
+
+    Args:
+        configs: Mêmes dicts que generate_multiple_parallel
+        max_workers: Nombre de workers parallèles (défaut: default_workers(len(configs)))
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    if max_workers is None:
+        max_workers = default_workers(len(configs))
+
+    _prefetch_areas(configs)
+    theme_names = sorted({cfg['theme'] for cfg in configs})
+
+    loop = asyncio.get_running_loop()
+    results = []
+
+    async def write(path, data):
+        try:
+            await loop.run_in_executor(io_pool, _write_file, path, data)
+            results.append(path)
+            print(f"✓ Généré: {path}")
+        except OSError as e:
+            print(f"✗ Erreur écriture {path}: {e}")
+
+    with render_pool(theme_names, max_workers, background_writer=False) as cpu_pool, \
+            ThreadPoolExecutor(max_workers=2) as io_pool:
+        renders = [loop.run_in_executor(cpu_pool, _render_bytes, cfg) for cfg in configs]
+        writes = []
+
+        for next_done in asyncio.as_completed(renders):
+            try:
+                path, data = await next_done
+            except Exception as e:
+                print(f"✗ Erreur: {e}")
+                continue
+            writes.append(asyncio.create_task(write(path, data)))
+
+        await asyncio.gather(*writes)
 
     return results
 
@@ -161,4 +507,7 @@ if __name__ == '__main__':
     print("  - load_fonts_cached()")
     print("  - create_fast_preview()")
     print("  - generate_multiple_parallel()")
+    print("  - generate_multiple_parallel_async()")
+    print("  - render_pool()")
+    print("  - server_pool_context()")
     print("  - setup_sqlite_cache()")
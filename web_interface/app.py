@@ -4,44 +4,148 @@ Interface web locale pour génération de posters
 Design épuré avec focus sur la carte et sélection de zone
 """
 
+from functools import lru_cache
 from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
+from geopy.extra.rate_limiter import RateLimiter
+from geopy.geocoders import Nominatim
 from pathlib import Path
+from urllib.parse import quote
+import hashlib
+import io
+import json
+import mimetypes
 import os
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 import multiprocessing
 
+import matplotlib
+# Serveur sans écran: Agg avant tout import de pyplot (par create_map_poster)
+matplotlib.use('Agg')
+
 # Ajouter le répertoire parent au path pour importer create_map_poster
 parent_dir = str(Path(__file__).resolve().parent.parent)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-# Changer le répertoire de travail vers le parent pour accéder aux fichiers
-os.chdir(parent_dir)
-
 from create_map_poster import (
     get_coordinates,
     get_available_themes,
-    create_poster
+    create_poster,
+    prefetch_map_data
 )
-import create_map_poster as cmp
 
 # Importer les fonctions optimisées
 from performance_optimizations import (
     load_theme_cached,
-    load_fonts_cached
+    load_fonts_cached,
+    render_pool,
+    server_pool_context
 )
 
 app = Flask(__name__)
 app.config['OUTPUT_DIR'] = Path(__file__).parent.parent / 'posters'
 
-# Flag pour annuler la génération en cours
-generation_cancelled = False
+# Téléchargements servis par le serveur web frontal plutôt que par Python:
+# USE_X_SENDFILE=1 pour Apache (mod_xsendfile) / lighttpd, X_ACCEL_PREFIX
+# (location nginx interne qui pointe sur OUTPUT_DIR, voir BACKEND.md)
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '') not in ('', '0')
+app.config['X_ACCEL_PREFIX'] = os.environ.get('X_ACCEL_PREFIX')
+
+# Les noms de posters sont uniques (_batch_names), leur contenu ne change
+# jamais: le navigateur peut les garder sans revalider
+DOWNLOAD_MAX_AGE = 7 * 24 * 3600
+
+
+def _warm_caches():
+    """
+    Charge polices et thèmes au démarrage plutôt qu'à la première requête
+
+    Les workers du pool de rendu ont leurs propres caches, remplis par
+    l'initializer du pool.
+    """
+    load_fonts_cached()
+    for theme_name in get_available_themes():
+        load_theme_cached(theme_name)
+
+
+_warm_caches()
+
+# Générations lancées par /api/generate, par identifiant. Chaque job tourne
+# dans un thread du serveur (le rendu lui-même est sur le pool de process);
+# /api/status en lit l'avancement, /api/cancel pose son 'cancel'.
+JOBS = {}
+JOBS_LOCK = threading.Lock()
+# Jobs terminés gardés pour /api/status (les plus anciens sont oubliés)
+MAX_FINISHED_JOBS = 20
+
+# Intervalle de vérification de l'annulation pendant les rendus (secondes)
+CANCEL_POLL_INTERVAL = 0.5
+
+# Manager des Events d'annulation: un proxy d'Event se passe en argument
+# aux workers du pool (un threading.Event n'existe que dans ce process)
+_MANAGER = None
+_MANAGER_LOCK = threading.Lock()
+
+# Pool de rendu partagé par tous les jobs, créé au premier job. Ce process
+# est multi-threadé (serveur threaded, threads des jobs): ses workers et
+# le Manager partent d'un forkserver (server_pool_context), jamais d'un
+# fork direct qui pourrait hériter d'un verrou tenu par un autre thread.
+RENDER_WORKERS = min(6, multiprocessing.cpu_count())
+_RENDER_POOL = None
+_RENDER_POOL_LOCK = threading.Lock()
+
+
+def _cancel_event():
+    """Nouvel Event d'annulation partagé avec les process de rendu"""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = server_pool_context().Manager()
+        return _MANAGER.Event()
+
+
+def _render_executor():
+    """Pool de rendu partagé (créé au premier appel)"""
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is None:
+            _RENDER_POOL = render_pool(
+                get_available_themes(), RENDER_WORKERS,
+                background_writer=False, mp_context=server_pool_context(),
+            )
+        return _RENDER_POOL
+
+
+def _discard_render_executor(executor):
+    """Oublie un pool cassé (worker mort): le prochain job en recrée un"""
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is executor:
+            _RENDER_POOL = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Géocodeur partagé par toutes les requêtes: son adapter requests garde une
+# Session, les appels suivants réutilisent la connexion TLS à Nominatim.
+# Au plus 1 requête/s (conditions d'utilisation de Nominatim); les erreurs
+# remontent à l'appelant au lieu d'être retentées.
+# L'appel est bloquant mais chaque requête HTTP a son thread (serveur
+# threaded): un géocodage en attente de Nominatim ne bloque que sa requête,
+# les autres routes (statut, SSE, téléchargements) continuent d'être servies.
+# Le RateLimiter est thread-safe et sérialise les appels réseau simultanés.
+_GEOLOCATOR = Nominatim(user_agent="maptoposter_web")
+_reverse = RateLimiter(_GEOLOCATOR.reverse, min_delay_seconds=1, max_retries=0, swallow_exceptions=False)
 
 # Presets de formats
 FORMAT_PRESETS = {
-    'A': {'width': 11.7, 'height': 16.5, 'name': 'Format A (PDF vectoriel)'},
+    # vector: couches de la carte gardées en tracés vectoriels (SVG/PDF)
+    # au lieu d'être aplaties en une image (create_poster(rasterize=...))
+    'A': {'width': 11.7, 'height': 16.5, 'name': 'Format A (PDF vectoriel)', 'vector': True},
     'square': {'width': 12, 'height': 12, 'name': 'Carré 12" × 12"'},
     'ultrawide': {'width': 11.47, 'height': 4.8, 'name': 'Ultrawide 21:9'},
     'custom': {'width': 12, 'height': 16, 'name': 'Personnalisé'},
@@ -52,42 +156,66 @@ FORMAT_PRESETS = {
 def index():
     """Page principale avec carte et interface"""
     themes = get_available_themes()
-    print(f"DEBUG: Loaded {len(themes)} themes: {themes}")
+    app.logger.debug("Loaded %d themes: %s", len(themes), themes)
     return render_template('index.html',
                          themes=themes,
                          format_presets=FORMAT_PRESETS)
 
 
+# Précision des coordonnées en cache: 4 décimales ≈ 11 m, un léger
+# déplacement de la carte retombe sur le même lieu
+GEOCODE_PRECISION = 4
+
+# Précision du centre d'une génération (≈ 11 m, décalage invisible sur le
+# poster). Les caches OSM sont indexés par centre et distance: sans arrondi,
+# chaque centre de carte Leaflet (15 décimales) relançait les téléchargements.
+AREA_PRECISION = 4
+
+
+@lru_cache(maxsize=4096)
+def _geocode_cached(lat_r, lng_r):
+    """
+    Reverse geocoding mis en cache par coordonnées arrondies
+
+    Returns:
+        (ville, pays, adresse complète), ou None si aucun lieu trouvé.
+        Les erreurs réseau ne sont pas mises en cache.
+    """
+    location = _reverse(f"{lat_r}, {lng_r}", language='fr')
+    if not location:
+        return None
+
+    address = location.raw.get('address', {})
+
+    # Extraire ville et pays
+    city = (address.get('city') or
+           address.get('town') or
+           address.get('village') or
+           address.get('municipality') or
+           'Unknown')
+
+    country = address.get('country', 'Unknown')
+
+    return city, country, location.address
+
+
 @app.route('/api/geocode', methods=['POST'])
 def reverse_geocode():
     """Reverse geocoding pour obtenir le nom du lieu"""
-    from geopy.geocoders import Nominatim
-
     data = request.json
     lat = data.get('lat')
     lng = data.get('lng')
 
     try:
-        geolocator = Nominatim(user_agent="maptoposter_web")
-        location = geolocator.reverse(f"{lat}, {lng}", language='fr')
-
-        if location:
-            address = location.raw.get('address', {})
-
-            # Extraire ville et pays
-            city = (address.get('city') or
-                   address.get('town') or
-                   address.get('village') or
-                   address.get('municipality') or
-                   'Unknown')
-
-            country = address.get('country', 'Unknown')
+        place = _geocode_cached(round(float(lat), GEOCODE_PRECISION), round(float(lng), GEOCODE_PRECISION))
 
+        if place:
+            city, country, full_address = place
             return jsonify({
                 'success': True,
                 'city': city,
                 'country': country,
-                'full_address': location.address
+                'full_address': full_address
             })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -96,36 +224,60 @@ def reverse_geocode():
 
 
 def generate_single_theme(theme, city, country, lat, lng, distance, output_format,
-                          width, height, country_label, gradient_height, output_dir):
+                          width, height, country_label, gradient_height, output_dir,
+                          city_slug, batch_stamp, dpi=300, cancel=None, vector=False):
     """
     Fonction worker pour générer un seul thème (appelée en parallèle)
+
+    Exécutée dans un process du pool de rendu: arguments et résultat
+    restent des types simples (output_dir est un str) pour le pickling.
+    city_slug et batch_stamp sont calculés une fois par génération (voir
+    _batch_names): seuls le thème et l'extension varient d'un fichier à
+    l'autre. Si l'Event cancel du job est posé quand le worker prend la
+    tâche, le rendu n'est pas lancé. vector garde les couches de la carte
+    en tracés vectoriels en SVG/PDF (plus lourd, plus lent à écrire).
+
+    Le fichier est rendu en mémoire et renvoyé dans 'data': c'est le job
+    (process parent) qui l'écrit, le worker passe directement au thème
+    suivant.
     """
+    if cancel is not None and cancel.is_set():
+        return {
+            'success': False,
+            'theme': theme,
+            'cancelled': True,
+            'error': 'Génération annulée'
+        }
+
     try:
-        # Charger le thème et les fonts avec cache
-        cmp.THEME = load_theme_cached(theme)
+        # Charger le thème et les fonts avec cache (pré-chargés par
+        # l'initializer du pool, une fois par process)
+        theme_data = load_theme_cached(theme)
         fonts = load_fonts_cached()
 
         # Nom de fichier
-        city_slug = city.lower().replace(' ', '_').replace(',', '')
-        timestamp = time.strftime('%Y%m%d_%H%M%S_%f')  # Ajout microsecondes pour unicité
-        filename = f"{city_slug}_{theme}_{distance}m_{timestamp}.{output_format}"
-        output_path = output_dir / filename
+        filename = f"{city_slug}_{theme}_{distance}m_{batch_stamp}.{output_format}"
+        output_path = Path(output_dir) / filename
 
         print(f"  🎨 {theme.upper()} - Début génération...")
 
         # Générer
+        buffer = io.BytesIO()
         create_poster(
             city=city,
             country=country,
             point=(lat, lng),
             dist=distance,
-            output_file=str(output_path),
+            output_file=buffer,
             output_format=output_format,
             width=width,
             height=height,
             country_label=country_label,
             fonts=fonts,
-            gradient_height=gradient_height
+            gradient_height=gradient_height,
+            theme=theme_data,
+            dpi=dpi,
+            rasterize=not vector
         )
 
         print(f"  ✓ {theme.upper()} - Terminé")
@@ -134,7 +286,8 @@ def generate_single_theme(theme, city, country, lat, lng, distance, output_forma
             'success': True,
             'theme': theme,
             'filename': filename,
-            'path': str(output_path)
+            'path': str(output_path),
+            'data': buffer.getvalue()
         }
     except Exception as e:
         print(f"  ❌ {theme.upper()} - Erreur: {e}")
@@ -145,25 +298,255 @@ def generate_single_theme(theme, city, country, lat, lng, distance, output_forma
         }
 
 
+def _job_changed(job):
+    """Signale un changement d'état du job aux flux /api/events en attente"""
+    with job['changed']:
+        job['version'] += 1
+        job['changed'].notify_all()
+
+
+def _job_status(job):
+    """État JSON d'un job, tel que renvoyé par /api/status"""
+    return {
+        'job_id': job['id'],
+        'done': job['done'],
+        'success': job['success'],
+        'cancelled': job['cancelled'],
+        'completed': job['completed'],
+        'total': job['total'],
+        'files': list(job['files']),
+        'message': job['message'],
+        'error': job['error'],
+        'traceback': job['traceback'],
+    }
+
+
+def _batch_names(city, job_id):
+    """
+    Parties communes des noms de fichiers d'une génération
+
+    Returns:
+        (city_slug, batch_stamp). Le suffixe du job rend les noms uniques
+        même pour deux générations lancées dans la même seconde
+        (time.strftime ne connaît pas %f).
+    """
+    city_slug = city.lower().replace(' ', '_').replace(',', '')
+    batch_stamp = f"{time.strftime('%Y%m%d_%H%M%S')}_{job_id[:8]}"
+    return city_slug, batch_stamp
+
+
+def _run_generation(job, city, country, lat, lng, distance, width, height, dpi,
+                    output_format, themes, country_label, gradient_height, vector):
+    """
+    Exécute un job de génération (thread dédié, lancé par /api/generate)
+
+    L'avancement et le résultat sont écrits dans le dict du job au fil des
+    rendus, pour /api/status.
+    """
+    try:
+        # Générer les posters avec optimisation
+        generated_files = job['files']
+        start_time = time.time()
+
+        total_themes = len(themes)
+        print(f"📊 {total_themes} thème(s) à générer")
+        print(f"📍 Ville: {city} ({distance}m)")
+        print(f"📐 Format: {width:.1f}×{height:.1f} inches → {output_format.upper()}")
+
+        # Pool partagé entre les jobs (max 6 cores utilisables)
+        print(f"⚡ Parallélisation: {min(RENDER_WORKERS, total_themes)} workers")
+        print("")
+
+        # Données OSM téléchargées une seule fois et écrites dans le cache
+        # disque, que les workers relisent au lieu de lancer chacun les
+        # mêmes requêtes
+        prefetch_map_data((lat, lng), distance, width, height)
+
+        city_slug, batch_stamp = _batch_names(city, job['id'])
+
+        # Génération PARALLÈLE sur des process: create_poster est limité par
+        # le CPU, des threads se partageraient un seul cœur (GIL)
+        executor = _render_executor()
+        # Écritures sur des threads du job: les workers enchaînent les rendus
+        # pendant que le poster précédent part sur disque
+        writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="poster-writer")
+        future_to_theme = {}
+        try:
+            # Soumettre toutes les tâches
+            for theme in themes:
+                future = executor.submit(
+                    generate_single_theme,
+                    theme, city, country, lat, lng, distance, output_format,
+                    width, height, country_label, gradient_height, str(app.config['OUTPUT_DIR']),
+                    city_slug, batch_stamp, dpi, job['cancel'], vector
+                )
+                future_to_theme[future] = theme
+            # Écriture en cours -> résultat du rendu correspondant
+            write_to_result = {}
+
+            # Traiter les résultats au fur et à mesure: un thème est terminé
+            # quand son fichier est écrit (ou quand son rendu a échoué)
+            completed = 0
+            pending = set(future_to_theme)
+            while pending:
+                # Réveil périodique: l'annulation est vue sans attendre la fin
+                # du rendu en cours
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+                # Vérifier si l'utilisateur a annulé
+                if job['cancel'].is_set():
+                    print(f"\n🛑 Génération annulée après {completed}/{total_themes} thème(s)")
+                    # Les tâches restantes du job sont annulées dans le
+                    # finally; les rendus déjà lancés se terminent en arrière-plan
+                    job.update(
+                        cancelled=True,
+                        message=f'Génération annulée. {len(generated_files)} poster(s) généré(s) avant l\'annulation.'
+                    )
+                    return
+
+                for future in done:
+                    if future in write_to_result:
+                        result = write_to_result.pop(future)
+                        theme = result['theme']
+                        completed += 1
+                        job['completed'] = completed
+                        try:
+                            future.result()
+                            generated_files.append({
+                                'theme': result['theme'],
+                                'filename': result['filename'],
+                                'path': result['path']
+                            })
+                            elapsed = time.time() - start_time
+                            avg_time = elapsed / completed if completed > 0 else 0
+                            remaining = avg_time * (total_themes - completed)
+                            print(f"  [{completed}/{total_themes}] ✓ {theme} OK - Reste: ~{int(remaining)}s")
+                        except OSError as e:
+                            print(f"  [{completed}/{total_themes}] ❌ {theme} ERREUR écriture: {e}")
+                        _job_changed(job)
+                        continue
+
+                    theme = future_to_theme[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool):
+                            _discard_render_executor(executor)
+                        result = {'success': False, 'theme': theme, 'error': f'EXCEPTION: {e}'}
+
+                    if result['success']:
+                        write = writer.submit(Path(result['path']).write_bytes, result.pop('data'))
+                        write_to_result[write] = result
+                        pending.add(write)
+                        continue
+
+                    completed += 1
+                    job['completed'] = completed
+                    print(f"  [{completed}/{total_themes}] ❌ {theme} ERREUR: {result.get('error', 'Unknown')}")
+                    _job_changed(job)
+        finally:
+            # Le pool sert aux autres jobs: seules les tâches de celui-ci,
+            # non commencées, sont retirées
+            for future in future_to_theme:
+                future.cancel()
+            # Les posters déjà rendus finissent d'être écrits
+            writer.shutdown(wait=False)
+
+        total_time = time.time() - start_time
+        print("")
+        print("="*60)
+        print(f"✅ TERMINÉ! {total_themes} poster(s) en {total_time:.1f}s")
+        print(f"📊 Moyenne: {total_time/total_themes:.1f}s par poster")
+        print("="*60)
+
+        job.update(success=True, message=f'{len(generated_files)} poster(s) généré(s) avec succès!')
+
+    except Exception as e:
+        import traceback
+        if isinstance(e, BrokenProcessPool):
+            _discard_render_executor(executor)
+        job.update(error=str(e), traceback=traceback.format_exc())
+    finally:
+        job['done'] = True
+        _job_changed(job)
+
+
+def _job_key(params):
+    """
+    Empreinte des paramètres d'une génération (ordre des thèmes ignoré)
+
+    Deux demandes identiques (double-clic, second onglet) ont la même clé
+    et donc le même résultat.
+    """
+    params = dict(params, themes=sorted(params['themes']))
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def _reusable_job(key):
+    """
+    Job existant qui répond déjà à une demande de clé key, ou None
+
+    Un job en cours (non annulé) est rejoint; un job réussi est repris si
+    chaque thème a donné un fichier (un thème en échec doit pouvoir être
+    relancé) et que tous sont encore dans OUTPUT_DIR. Appelé sous JOBS_LOCK.
+    """
+    for job in JOBS.values():
+        if job['key'] != key or job['cancel'].is_set():
+            continue
+        if not job['done']:
+            return job
+        if (job['success'] and len(job['files']) == job['total']
+                and all(Path(f['path']).is_file() for f in job['files'])):
+            return job
+    return None
+
+
+def _attach_job(key):
+    """
+    Comme _reusable_job, en comptant un client de plus sur un job en cours
+
+    Un job partagé n'est annulé que lorsque tous ses clients l'ont quitté
+    (voir /api/cancel). Appelé sous JOBS_LOCK.
+    """
+    job = _reusable_job(key)
+    if job is not None and not job['done']:
+        job['clients'] += 1
+    return job
+
+
+def _forget_finished_jobs():
+    """Limite la mémoire des jobs terminés à MAX_FINISHED_JOBS"""
+    with JOBS_LOCK:
+        finished = [job_id for job_id, job in JOBS.items() if job['done']]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del JOBS[job_id]
+
+
 @app.route('/api/generate', methods=['POST'])
 def generate_poster():
-    """Génère un ou plusieurs posters selon les paramètres"""
-    import json as json_module
+    """
+    Lance la génération d'un ou plusieurs posters selon les paramètres
+
+    Répond immédiatement avec l'identifiant du job; le rendu continue en
+    arrière-plan et son avancement se lit sur /api/status/<job_id>.
+    """
     data = request.json
 
     print("\n" + "="*60)
     print("🚀 GÉNÉRATION LANCÉE")
     print("="*60)
-    print("📥 [BACKEND] Données reçues:")
-    print(json_module.dumps(data, indent=2, ensure_ascii=False))
-    print("="*60)
+    # Corps complet seulement en mode debug: le logger ne formate le message
+    # (%s) que si le niveau DEBUG est actif
+    app.logger.debug("📥 [BACKEND] Données reçues: %s", data)
 
     try:
         # Paramètres de base
         city = data.get('city')
         country = data.get('country')
-        lat = float(data.get('lat'))
-        lng = float(data.get('lng'))
+        # Centre arrondi comme les coordonnées imprimées sur le poster: un
+        # léger déplacement de la carte retombe sur les mêmes caches OSM
+        lat = round(float(data.get('lat')), AREA_PRECISION)
+        lng = round(float(data.get('lng')), AREA_PRECISION)
 
         print(f"📍 [BACKEND] Localisation: {city}, {country}")
         print(f"🗺️ [BACKEND] Coordonnées: {lat:.6f}, {lng:.6f}")
@@ -200,92 +583,8 @@ def generate_poster():
         themes = data.get('themes', ['terracotta'])
         country_label = data.get('country_label', country)
         gradient_height = float(data.get('gradient_height', 0.25))  # Default 25%
-
-        # Réinitialiser le flag d'annulation au début de chaque génération
-        global generation_cancelled
-        generation_cancelled = False
-
-        # Générer les posters avec optimisation
-        generated_files = []
-        start_time = time.time()
-
-        # Charger les fonts une seule fois (optimisation)
-        print("⚡ Chargement des fonts (cache)...")
-        fonts = load_fonts_cached()
-
-        total_themes = len(themes)
-        print(f"📊 {total_themes} thème(s) à générer")
-        print(f"📍 Ville: {city} ({distance}m)")
-        print(f"📐 Format: {width:.1f}×{height:.1f} inches → {output_format.upper()}")
-
-        # Déterminer le nombre de workers (max 6 cores utilisables)
-        num_workers = min(6, multiprocessing.cpu_count(), total_themes)
-        print(f"⚡ Parallélisation: {num_workers} workers")
-        print("")
-
-        # Génération PARALLÈLE avec ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            # Soumettre toutes les tâches
-            future_to_theme = {
-                executor.submit(
-                    generate_single_theme,
-                    theme, city, country, lat, lng, distance, output_format,
-                    width, height, country_label, gradient_height, app.config['OUTPUT_DIR']
-                ): theme
-                for theme in themes
-            }
-
-            # Traiter les résultats au fur et à mesure
-            completed = 0
-            for future in as_completed(future_to_theme):
-                # Vérifier si l'utilisateur a annulé
-                if generation_cancelled:
-                    print(f"\n🛑 Génération annulée après {completed}/{total_themes} thème(s)")
-                    # Annuler les tâches restantes
-                    for f in future_to_theme:
-                        f.cancel()
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    return jsonify({
-                        'success': False,
-                        'cancelled': True,
-                        'files': generated_files,
-                        'message': f'Génération annulée. {len(generated_files)} poster(s) généré(s) avant l\'annulation.'
-                    })
-
-                theme = future_to_theme[future]
-                try:
-                    result = future.result()
-                    completed += 1
-
-                    if result['success']:
-                        generated_files.append({
-                            'theme': result['theme'],
-                            'filename': result['filename'],
-                            'path': result['path']
-                        })
-                        elapsed = time.time() - start_time
-                        avg_time = elapsed / completed if completed > 0 else 0
-                        remaining = avg_time * (total_themes - completed)
-                        print(f"  [{completed}/{total_themes}] ✓ {theme} OK - Reste: ~{int(remaining)}s")
-                    else:
-                        print(f"  [{completed}/{total_themes}] ❌ {theme} ERREUR: {result.get('error', 'Unknown')}")
-
-                except Exception as e:
-                    completed += 1
-                    print(f"  [{completed}/{total_themes}] ❌ {theme} EXCEPTION: {e}")
-
-        total_time = time.time() - start_time
-        print("")
-        print("="*60)
-        print(f"✅ TERMINÉ! {total_themes} poster(s) en {total_time:.1f}s")
-        print(f"📊 Moyenne: {total_time/total_themes:.1f}s par poster")
-        print("="*60)
-
-        return jsonify({
-            'success': True,
-            'files': generated_files,
-            'message': f'{len(generated_files)} poster(s) généré(s) avec succès!'
-        })
+        # Carte vectorielle (SVG/PDF): imposée par le preset, ou demandée
+        vector = bool(data.get('vector', preset.get('vector', False)))
 
     except Exception as e:
         import traceback
@@ -295,12 +594,136 @@ def generate_poster():
             'traceback': traceback.format_exc()
         }), 500
 
+    params = {
+        'city': city, 'country': country, 'lat': lat, 'lng': lng, 'distance': distance,
+        'width': width, 'height': height, 'dpi': dpi, 'output_format': output_format,
+        'themes': themes, 'country_label': country_label, 'gradient_height': gradient_height,
+        'vector': vector,
+    }
+    key = _job_key(params)
+
+    _forget_finished_jobs()
+    with JOBS_LOCK:
+        existing = _attach_job(key)
+    if existing is not None:
+        print(f"♻️  [BACKEND] Demande identique au job {existing['id']}, pas de nouveau rendu")
+        return jsonify({'success': True, 'job_id': existing['id'], 'reused': True}), 202
+
+    job = {
+        'id': uuid.uuid4().hex,
+        'key': key,
+        'done': False,
+        'success': False,
+        'cancelled': False,
+        'completed': 0,
+        'total': len(themes),
+        'files': [],
+        'message': None,
+        'error': None,
+        'traceback': None,
+        'cancel': _cancel_event(),
+        # Demandes rattachées au job (la première + les identiques)
+        'clients': 1,
+        # Incrémenté (sous changed) à chaque poster terminé et en fin de job
+        'version': 0,
+        'changed': threading.Condition(),
+    }
+    with JOBS_LOCK:
+        # Une demande identique a pu être enregistrée entre-temps
+        existing = _attach_job(key)
+        if existing is None:
+            JOBS[job['id']] = job
+    if existing is not None:
+        return jsonify({'success': True, 'job_id': existing['id'], 'reused': True}), 202
+
+    threading.Thread(
+        target=_run_generation,
+        args=(job,),
+        kwargs=params,
+        name=f"generation-{job['id']}",
+        daemon=True,
+    ).start()
+
+    return jsonify({'success': True, 'job_id': job['id']}), 202
+
+
+@app.route('/api/status/<job_id>')
+def generation_status(job_id):
+    """Avancement et résultat d'un job de génération"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify(_job_status(job))
+
+
+# Délai max sans message sur /api/events: l'état courant est renvoyé, ce qui
+# maintient la connexion ouverte à travers les proxies
+EVENTS_KEEPALIVE = 15
+
+
+def _event_stream(job):
+    """
+    Flux Server-Sent Events d'un job: un message par poster terminé
+
+    Chaque message porte l'état complet (comme /api/status), le dernier est
+    de type 'done'.
+    """
+    version = None
+    while True:
+        with job['changed']:
+            job['changed'].wait_for(lambda: job['version'] != version, timeout=EVENTS_KEEPALIVE)
+            version = job['version']
+            status = _job_status(job)
+        if status['done']:
+            yield f"event: done\ndata: {json.dumps(status)}\n\n"
+            return
+        yield f"data: {json.dumps(status)}\n\n"
+
+
+@app.route('/api/events/<job_id>')
+def generation_events(job_id):
+    """Avancement d'un job en continu (Server-Sent Events)"""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return Response(
+        stream_with_context(_event_stream(job)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache'},
+    )
+
 
 @app.route('/api/cancel', methods=['POST'])
 def cancel_generation():
-    """Annule la génération en cours"""
-    global generation_cancelled
-    generation_cancelled = True
+    """
+    Quitte le job job_id (corps JSON) pour le client qui l'annule
+
+    Un job peut être partagé par plusieurs demandes identiques: il n'est
+    annulé qu'au départ de son dernier client. Les autres reçoivent
+    'detached' et cessent de le suivre, le rendu continue pour le reste.
+    """
+    job_id = (request.get_json(silent=True) or {}).get('job_id')
+    if not job_id:
+        return jsonify({'success': False, 'error': 'job_id requis'}), 400
+
+    with JOBS_LOCK:
+        job = JOBS.get(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Job inconnu'}), 404
+        if job['done']:
+            return jsonify({'success': True, 'message': 'Job déjà terminé'})
+        job['clients'] -= 1
+        remaining = job['clients']
+        if remaining <= 0:
+            job['cancel'].set()
+
+    if remaining > 0:
+        print(f"\n🛑 [BACKEND] Un client quitte le job {job_id}, {remaining} le suivent encore")
+        return jsonify({
+            'success': True,
+            'detached': True,
+            'message': f'Génération poursuivie pour {remaining} autre(s) demande(s) identique(s)'
+        })
     print("\n🛑 [BACKEND] Annulation demandée par l'utilisateur")
     return jsonify({'success': True, 'message': 'Génération annulée'})
 
@@ -309,9 +732,20 @@ def cancel_generation():
 def download_file(filename):
     """Télécharge un fichier généré"""
     file_path = app.config['OUTPUT_DIR'] / filename
-    if file_path.exists():
-        return send_file(file_path, as_attachment=True)
-    return jsonify({'error': 'File not found'}), 404
+    if not file_path.is_file():
+        return jsonify({'error': 'File not found'}), 404
+
+    if app.config['X_ACCEL_PREFIX']:
+        # nginx lit et envoie le fichier lui-même (sendfile), Flask ne
+        # renvoie que les en-têtes
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = app.config['X_ACCEL_PREFIX'].rstrip('/') + '/' + quote(filename)
+        response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        return response
+
+    # conditional/etag: un nouveau téléchargement du même fichier se
+    # termine en 304, sans renvoyer le contenu
+    return send_file(file_path, as_attachment=True, conditional=True, etag=True, max_age=DOWNLOAD_MAX_AGE)
 
 
 if __name__ == '__main__':
@@ -332,4 +766,4 @@ if __name__ == '__main__':
     print("=" * 60)
     print()
 
-    app.run(debug=True, port=5000)
+    app.run(debug=True, port=5000, threaded=True)
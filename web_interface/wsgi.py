@@ -0,0 +1,15 @@
+"""
+Point d'entrée WSGI pour un serveur de production
+
+    cd web_interface
+    gunicorn -w 1 -k gthread --threads 8 --preload wsgi:app
+
+--preload importe l'application (préchauffage des polices et thèmes) avant
+de forker le worker. Un seul worker: les jobs de génération (JOBS) vivent
+dans la mémoire du process, et c'est lui qui pilote le pool de rendu; les
+threads servent les requêtes concurrentes (statut, SSE, téléchargements).
+"""
+
+from app import app
+
+__all__ = ["app"]